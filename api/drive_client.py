@@ -3,27 +3,89 @@ Google Drive API client for document retrieval.
 """
 import os
 import io
-from typing import List, Dict, Optional
-from googleapiclient.discovery import build
+import asyncio
+import itertools
+import threading
+from typing import List, Dict, Iterator, Optional, Tuple, Union
+import httplib2
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 import structlog
 
+from api.json_export import JsonArrayWriter
+from api.retry import RETRYABLE_STATUS_CODES, api_retry
+from storage.cache_manager import CloudStorageCache
+
 logger = structlog.get_logger()
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """Check whether a Drive API error is transient."""
+    return isinstance(exc, HttpError) and exc.resp.status in RETRYABLE_STATUS_CODES
+
+
+@api_retry(_is_retryable)
+def _execute(request, http: Optional[AuthorizedHttp] = None):
+    """Execute a Drive API (or batch) request, retrying transient failures."""
+    return request.execute(http=http)
+
+
+@api_retry(_is_retryable)
+def _next_chunk(downloader: MediaIoBaseDownload):
+    """Download the next media chunk, retrying transient failures."""
+    return downloader.next_chunk()
+
+
 class DriveClient:
     """Client for interacting with Google Drive API."""
 
     SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
-    def __init__(self, credentials_path: Optional[str] = None):
+    # Socket timeout for Drive HTTP connections
+    HTTP_TIMEOUT_SECONDS = 30
+
+    # Maximum number of concurrent downloads in export_sample_documents
+    MAX_CONCURRENT_DOWNLOADS = 8
+
+    # Listed files buffered ahead of the download workers in export_sample_documents
+    EXPORT_QUEUE_SIZE = 32
+
+    # Drive answers large batch requests with HTTP 500s, so keep batches small
+    METADATA_BATCH_SIZE = 25
+
+    # Bytes requested per round-trip when downloading file content
+    DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+    # Bytes downloaded for each content preview in export_sample_documents
+    PREVIEW_BYTES = 512
+
+    # Largest page size accepted by files.list
+    MAX_PAGE_SIZE = 1000
+
+    # File fields returned by listings; extra fields such as owners cost server time per file
+    FILE_FIELDS = "id, name, mimeType, createdTime, modifiedTime, size"
+
+    # Google Workspace types and the plain format they are exported as
+    EXPORT_MIME_TYPES = {
+        'application/vnd.google-apps.document': 'text/plain',
+        'application/vnd.google-apps.spreadsheet': 'text/csv',
+        'application/vnd.google-apps.presentation': 'text/plain'
+    }
+
+    def __init__(
+        self,
+        credentials_path: Optional[str] = None,
+        cache: Optional[CloudStorageCache] = None
+    ):
         """
         Initialize Google Drive client.
 
         Args:
             credentials_path: Path to service account credentials JSON file.
                             If not provided, reads from GOOGLE_APPLICATION_CREDENTIALS env var.
+            cache: Optional cache for downloaded content, keyed by file ID and modifiedTime.
         """
         self.credentials_path = credentials_path or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
         if not self.credentials_path:
@@ -34,8 +96,31 @@ class DriveClient:
             scopes=self.SCOPES
         )
 
+        # Imported here: discovery is by far the heaviest part of googleapiclient
+        from googleapiclient.discovery import build
+
         self.service = build('drive', 'v3', credentials=self.credentials)
         self.folder_id = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
+        self.cache = cache
+
+        # httplib2 is not thread-safe, so each worker thread gets its own transport
+        self._local = threading.local()
+
+    def _authorized_http(self) -> AuthorizedHttp:
+        """
+        Get the calling thread's authorized HTTP transport.
+
+        The transport is created once per thread and reused for every request,
+        so its keep-alive connections (and TLS sessions) carry across calls.
+        """
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = AuthorizedHttp(
+                self.credentials,
+                http=httplib2.Http(timeout=self.HTTP_TIMEOUT_SECONDS)
+            )
+            self._local.http = http
+        return http
 
     def test_connection(self) -> bool:
         """
@@ -45,18 +130,88 @@ class DriveClient:
             True if connection successful, False otherwise.
         """
         try:
-            about = self.service.about().get(fields="user").execute()
+            about = _execute(self.service.about().get(fields="user"), self._authorized_http())
             logger.info("drive_connection_test_success", user=about.get("user", {}).get("emailAddress"))
             return True
         except Exception as e:
             logger.error("drive_connection_test_failed", error=str(e))
             return False
 
+    def _iter_query(
+        self,
+        query: Optional[str],
+        fields: str,
+        page_size: int
+    ) -> Iterator[Dict]:
+        """
+        Iterate over files.list results, following nextPageToken.
+
+        Args:
+            query: Drive search query.
+            fields: File fields to return.
+            page_size: Number of files requested per page.
+
+        Yields:
+            File metadata dictionaries.
+        """
+        page_token = None
+        while True:
+            results = _execute(
+                self.service.files().list(
+                    q=query,
+                    pageSize=page_size,
+                    pageToken=page_token,
+                    fields=f"nextPageToken, files({fields})"
+                ),
+                self._authorized_http()
+            )
+
+            yield from results.get('files', [])
+
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                break
+
+    def iter_files(
+        self,
+        folder_id: Optional[str] = None,
+        mime_types: Optional[List[str]] = None,
+        fields: Optional[str] = None,
+        page_size: int = MAX_PAGE_SIZE
+    ) -> Iterator[Dict]:
+        """
+        Lazily iterate over all files in a folder, across result pages.
+
+        Args:
+            folder_id: Folder ID to list files from. Uses default if not provided.
+            mime_types: List of MIME types to filter by.
+            fields: File fields to return. Defaults to FILE_FIELDS.
+            page_size: Number of files requested per API call.
+
+        Yields:
+            File metadata dictionaries.
+        """
+        folder = folder_id or self.folder_id
+
+        # Build query
+        query_parts = []
+        if folder:
+            query_parts.append(f"'{folder}' in parents")
+
+        if mime_types:
+            mime_query = " or ".join(f"mimeType='{mt}'" for mt in mime_types)
+            query_parts.append(f"({mime_query})")
+
+        query = " and ".join(query_parts) if query_parts else None
+
+        yield from self._iter_query(query, fields or self.FILE_FIELDS, page_size)
+
     def list_files(
         self,
         folder_id: Optional[str] = None,
         page_size: int = 100,
-        mime_types: Optional[List[str]] = None
+        mime_types: Optional[List[str]] = None,
+        fields: Optional[str] = None
     ) -> List[Dict]:
         """
         List files in a folder.
@@ -65,82 +220,153 @@ class DriveClient:
             folder_id: Folder ID to list files from. Uses default if not provided.
             page_size: Maximum number of files to retrieve.
             mime_types: List of MIME types to filter by.
+            fields: File fields to return. Defaults to FILE_FIELDS.
 
         Returns:
             List of file metadata dictionaries.
         """
-        folder = folder_id or self.folder_id
-
         try:
-            # Build query
-            query_parts = []
-            if folder:
-                query_parts.append(f"'{folder}' in parents")
-
-            if mime_types:
-                mime_query = " or ".join([f"mimeType='{mt}'" for mt in mime_types])
-                query_parts.append(f"({mime_query})")
-
-            query = " and ".join(query_parts) if query_parts else None
-
-            # Execute query
-            results = self.service.files().list(
-                q=query,
-                pageSize=page_size,
-                fields="files(id, name, mimeType, createdTime, modifiedTime, size, owners)"
-            ).execute()
-
-            files = results.get('files', [])
+            files = list(itertools.islice(
+                self.iter_files(
+                    folder_id=folder_id,
+                    mime_types=mime_types,
+                    fields=fields,
+                    page_size=min(page_size, self.MAX_PAGE_SIZE)
+                ),
+                page_size
+            ))
             logger.info("drive_files_listed", count=len(files))
             return files
         except Exception as e:
             logger.error("drive_list_files_failed", error=str(e))
             return []
 
-    def get_file_content(self, file_id: str) -> Optional[str]:
+    def get_files_metadata(
+        self,
+        file_ids: List[str],
+        fields: str = "id, name, mimeType"
+    ) -> Dict[str, Dict]:
         """
-        Download and retrieve file content.
+        Retrieve metadata for several files using batched requests.
 
         Args:
-            file_id: File ID to download.
+            file_ids: File IDs to look up.
+            fields: Fields to request for each file.
 
         Returns:
-            File content as string, or None if download fails.
+            Dictionary mapping file ID to its metadata. Failed lookups are omitted.
         """
+        metadata = {}
+
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("drive_file_metadata_failed", file_id=request_id, error=str(exception))
+            else:
+                metadata[request_id] = response
+
         try:
-            # Get file metadata first
-            file_metadata = self.service.files().get(fileId=file_id, fields="mimeType, name").execute()
+            for i in range(0, len(file_ids), self.METADATA_BATCH_SIZE):
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for file_id in file_ids[i:i + self.METADATA_BATCH_SIZE]:
+                    batch.add(
+                        self.service.files().get(fileId=file_id, fields=fields),
+                        request_id=file_id
+                    )
+                _execute(batch, self._authorized_http())
+        except Exception as e:
+            logger.error("drive_batch_metadata_failed", error=str(e))
+
+        return metadata
+
+    def _build_media_request(
+        self,
+        file_id: str,
+        mime_type: Optional[str],
+        http: AuthorizedHttp
+    ) -> Tuple[object, Optional[str]]:
+        """
+        Build the export or download request for a file.
+
+        Args:
+            file_id: File ID to download.
+            mime_type: MIME type of the file, looked up if not provided.
+            http: Authorized HTTP transport to run the request on.
+
+        Returns:
+            Tuple of the media request ready for MediaIoBaseDownload and the file's MIME type.
+        """
+        if mime_type is None:
+            file_metadata = _execute(
+                self.service.files().get(fileId=file_id, fields="mimeType, name"),
+                http
+            )
             mime_type = file_metadata.get('mimeType')
 
+        if mime_type in self.EXPORT_MIME_TYPES:
             # Handle Google Docs export
-            if mime_type == 'application/vnd.google-apps.document':
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType='text/plain'
-                )
-            elif mime_type == 'application/vnd.google-apps.spreadsheet':
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType='text/csv'
-                )
-            elif mime_type == 'application/vnd.google-apps.presentation':
-                request = self.service.files().export_media(
-                    fileId=file_id,
-                    mimeType='text/plain'
-                )
-            else:
-                # Download binary files
-                request = self.service.files().get_media(fileId=file_id)
+            request = self.service.files().export_media(
+                fileId=file_id,
+                mimeType=self.EXPORT_MIME_TYPES[mime_type]
+            )
+        else:
+            # Download binary files
+            request = self.service.files().get_media(fileId=file_id)
+
+        request.http = http
+        return request, mime_type
+
+    def _is_text(self, mime_type: Optional[str]) -> bool:
+        """Check whether a file's downloaded content is text."""
+        return mime_type in self.EXPORT_MIME_TYPES or (mime_type or "").startswith("text/")
+
+    def _download(self, request, fh: io.IOBase, max_bytes: Optional[int] = None) -> None:
+        """
+        Download a media request into a file object.
+
+        Args:
+            request: Media request to download.
+            fh: Writable binary file object.
+            max_bytes: Stop once at least this many bytes have been written.
+        """
+        chunksize = min(self.DOWNLOAD_CHUNK_SIZE, max_bytes) if max_bytes else self.DOWNLOAD_CHUNK_SIZE
+        downloader = MediaIoBaseDownload(fh, request, chunksize=chunksize)
+
+        done = False
+        while not done:
+            status, done = _next_chunk(downloader)
+            if max_bytes and fh.tell() >= max_bytes:
+                break
+
+    def get_file_content(
+        self,
+        file_id: str,
+        mime_type: Optional[str] = None,
+        max_bytes: Optional[int] = None
+    ) -> Optional[Union[str, bytes]]:
+        """
+        Download and retrieve file content.
+
+        Args:
+            file_id: File ID to download.
+            mime_type: MIME type of the file, if already known. Skips the metadata lookup.
+            max_bytes: Stop downloading once this many bytes are received (None for the whole file).
+
+        Returns:
+            File content as string for text and Google Workspace files, raw bytes for
+            binary files (e.g. PDF), or None if download fails.
+        """
+        try:
+            request, mime_type = self._build_media_request(file_id, mime_type, self._authorized_http())
 
             # Download content
             fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
+            self._download(request, fh, max_bytes)
 
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-
-            content = fh.getvalue().decode('utf-8', errors='ignore')
+            # Decoding binary formats only produces garbage, so leave them to the caller
+            if self._is_text(mime_type):
+                content = fh.getvalue().decode('utf-8', errors='ignore')
+            else:
+                content = fh.getvalue()
 
             logger.info("drive_file_downloaded", file_id=file_id, size=len(content))
             return content
@@ -148,10 +374,41 @@ class DriveClient:
             logger.error("drive_file_download_failed", file_id=file_id, error=str(e))
             return None
 
+    def download_to(
+        self,
+        file_id: str,
+        path: str,
+        mime_type: Optional[str] = None
+    ) -> bool:
+        """
+        Download file content straight to disk without holding it in memory.
+
+        Args:
+            file_id: File ID to download.
+            path: Destination file path.
+            mime_type: MIME type of the file, if already known. Skips the metadata lookup.
+
+        Returns:
+            True if download successful, False otherwise.
+        """
+        try:
+            request, _ = self._build_media_request(file_id, mime_type, self._authorized_http())
+
+            with open(path, "wb") as fh:
+                self._download(request, fh)
+                size = fh.tell()
+
+            logger.info("drive_file_downloaded", file_id=file_id, path=path, size=size)
+            return True
+        except Exception as e:
+            logger.error("drive_file_download_failed", file_id=file_id, error=str(e))
+            return False
+
     def search_files(
         self,
         query: str,
-        page_size: int = 100
+        page_size: int = 100,
+        fields: Optional[str] = None
     ) -> List[Dict]:
         """
         Search for files by name or content.
@@ -159,6 +416,7 @@ class DriveClient:
         Args:
             query: Search query string.
             page_size: Maximum number of results.
+            fields: File fields to return. Defaults to FILE_FIELDS.
 
         Returns:
             List of file metadata dictionaries.
@@ -166,19 +424,81 @@ class DriveClient:
         try:
             search_query = f"name contains '{query}' or fullText contains '{query}'"
 
-            results = self.service.files().list(
-                q=search_query,
-                pageSize=page_size,
-                fields="files(id, name, mimeType, createdTime, modifiedTime, size)"
-            ).execute()
-
-            files = results.get('files', [])
+            files = list(itertools.islice(
+                self._iter_query(
+                    search_query,
+                    fields or self.FILE_FIELDS,
+                    min(page_size, self.MAX_PAGE_SIZE)
+                ),
+                page_size
+            ))
             logger.info("drive_search_complete", query=query, count=len(files))
             return files
         except Exception as e:
             logger.error("drive_search_failed", query=query, error=str(e))
             return []
 
+    async def _aget_file_content(
+        self,
+        file_metadata: Dict,
+        max_bytes: Optional[int] = None
+    ) -> Optional[Union[str, bytes]]:
+        """
+        Download a file without blocking the event loop.
+
+        Files whose content is cached for their current modifiedTime are not
+        downloaded again.
+
+        Args:
+            file_metadata: File metadata dictionary (must include id, may include mimeType).
+            max_bytes: Download limit passed to get_file_content.
+
+        Returns:
+            File content, or None if download fails.
+        """
+        cache_key = None
+        if self.cache and file_metadata.get('modifiedTime'):
+            cache_key = f"drive:{file_metadata['id']}:{file_metadata['modifiedTime']}:{max_bytes or 'full'}"
+            # Cache reads and writes are blocking file/GCS I/O, so they run off the event loop
+            content = await asyncio.to_thread(self.cache.get, cache_key)
+            if content is not None:
+                return content
+
+        content = await asyncio.to_thread(
+            self.get_file_content,
+            file_metadata['id'],
+            file_metadata.get('mimeType'),
+            max_bytes
+        )
+
+        # Binary content is not JSON-serializable, so only text is cached
+        if cache_key and isinstance(content, str):
+            await asyncio.to_thread(self.cache.set, cache_key, content)
+        return content
+
+    def _next_file_batch(self, files: Iterator[Dict], size: int) -> List[Dict]:
+        """
+        Take the next batch of listed files, filling in any missing mimeType.
+
+        Args:
+            files: File metadata iterator, e.g. from iter_files.
+            size: Maximum number of files to take.
+
+        Returns:
+            List of file metadata dictionaries (empty once the listing is exhausted).
+        """
+        batch = list(itertools.islice(files, size))
+
+        # The listing normally carries mimeType already; batch-fetch any that are missing
+        missing_ids = [f['id'] for f in batch if not f.get('mimeType')]
+        if missing_ids:
+            batch_metadata = self.get_files_metadata(missing_ids)
+            for file_metadata in batch:
+                if file_metadata['id'] in batch_metadata:
+                    file_metadata['mimeType'] = batch_metadata[file_metadata['id']].get('mimeType')
+
+        return batch
+
     def export_sample_documents(
         self,
         num_docs: int = 10,
@@ -194,8 +514,27 @@ class DriveClient:
         Returns:
             List of exported documents.
         """
-        import json
+        return asyncio.run(self._aexport_sample_documents(num_docs, output_file))
+
+    async def _aexport_sample_documents(
+        self,
+        num_docs: int,
+        output_file: str
+    ) -> List[Dict]:
+        """
+        Export sample documents, overlapping listing, downloading and writing.
+
+        A producer feeds listed files into a bounded queue while download
+        workers consume it and write each document as soon as it is ready, so
+        documents appear in the output in completion order.
 
+        Args:
+            num_docs: Number of documents to export.
+            output_file: Output file path.
+
+        Returns:
+            List of exported documents.
+        """
         # Get Google Docs, Sheets, and standard documents
         mime_types = [
             'application/vnd.google-apps.document',
@@ -204,28 +543,69 @@ class DriveClient:
             'text/plain'
         ]
 
-        files = self.list_files(mime_types=mime_types, page_size=num_docs)
+        queue = asyncio.Queue(maxsize=self.EXPORT_QUEUE_SIZE)
         exported_docs = []
 
-        for file_metadata in files[:num_docs]:
-            file_id = file_metadata['id']
-            content = self.get_file_content(file_id)
-
-            if content:
-                exported_docs.append({
-                    "file_id": file_id,
+        async def produce() -> None:
+            try:
+                files = self.iter_files(
+                    mime_types=mime_types,
+                    page_size=min(num_docs, self.MAX_PAGE_SIZE)
+                )
+                listed = 0
+                while listed < num_docs:
+                    batch = await asyncio.to_thread(
+                        self._next_file_batch,
+                        files,
+                        min(self.METADATA_BATCH_SIZE, num_docs - listed)
+                    )
+                    if not batch:
+                        break
+                    listed += len(batch)
+                    for file_metadata in batch:
+                        await queue.put(file_metadata)
+                logger.info("drive_files_listed", count=listed)
+            except Exception as e:
+                logger.error("drive_list_files_failed", error=str(e))
+            finally:
+                # One stop marker per worker
+                for _ in range(self.MAX_CONCURRENT_DOWNLOADS):
+                    await queue.put(None)
+
+        async def consume(writer: JsonArrayWriter) -> None:
+            while True:
+                file_metadata = await queue.get()
+                if file_metadata is None:
+                    return
+
+                # Only a preview is exported, so avoid downloading whole files
+                content = await self._aget_file_content(file_metadata, max_bytes=self.PREVIEW_BYTES)
+                if not content:
+                    continue
+
+                size = file_metadata.get("size")
+                doc = {
+                    "file_id": file_metadata['id'],
                     "name": file_metadata.get("name"),
                     "mime_type": file_metadata.get("mimeType"),
                     "created_time": file_metadata.get("createdTime"),
                     "modified_time": file_metadata.get("modifiedTime"),
-                    "size": file_metadata.get("size"),
-                    "content_preview": content[:500] if len(content) > 500 else content,
-                    "content_length": len(content)
-                })
-
-        # Save to file
-        with open(output_file, "w") as f:
-            json.dump(exported_docs, f, indent=2)
+                    "size": size,
+                    # Binary files have no meaningful text preview
+                    "content_preview": content[:500] if isinstance(content, str) else "",
+                    # Downloads stop after the preview, so the full length is only known
+                    # when Drive reports a size (Workspace docs do not)
+                    "content_length": int(size) if size else None
+                }
+                writer.write(doc)
+                exported_docs.append(doc)
+
+        # Write each document to file as soon as it is downloaded
+        with JsonArrayWriter(output_file) as writer:
+            await asyncio.gather(
+                produce(),
+                *(consume(writer) for _ in range(self.MAX_CONCURRENT_DOWNLOADS))
+            )
 
         logger.info(
             "drive_sample_export_complete",
@@ -0,0 +1,59 @@
+"""
+Incremental JSON array writer for sample exports.
+"""
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    """Serialize a record to UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+class JsonArrayWriter:
+    """
+    Writes records to a JSON array file one at a time.
+
+    Each record is serialized as soon as it is written, one record per line,
+    so exports never format the whole result set in a single pass. The output
+    is a regular JSON array and can be read back with json.load.
+    """
+
+    def __init__(self, output_file: str):
+        """
+        Initialize writer.
+
+        Args:
+            output_file: Output file path.
+        """
+        self.output_file = output_file
+        self.count = 0
+        self._file = None
+
+    def __enter__(self) -> "JsonArrayWriter":
+        self._file = open(self.output_file, "wb")
+        self._file.write(b"[")
+        return self
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """
+        Append a record to the array.
+
+        Args:
+            record: JSON-serializable record.
+        """
+        self._file.write(b",\n" if self.count else b"\n")
+        self._file.write(_dumps(record))
+        self.count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.write(b"\n]\n" if self.count else b"]\n")
+        self._file.close()
+        self._file = None
@@ -2,29 +2,92 @@
 Notion API client for page and database retrieval.
 """
 import os
-from typing import List, Dict, Optional
-from notion_client import Client
+import io
+import asyncio
+from typing import List, Dict, Iterable, Iterator, Optional
 import structlog
 
+from api.json_export import JsonArrayWriter
+from api.retry import RETRYABLE_STATUS_CODES, api_retry
+from storage.cache_manager import CloudStorageCache
+
 logger = structlog.get_logger()
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """Check whether a Notion API error is transient."""
+    from notion_client.errors import HTTPResponseError, RequestTimeoutError
+
+    if isinstance(exc, RequestTimeoutError):
+        return True
+    return isinstance(exc, HTTPResponseError) and exc.status in RETRYABLE_STATUS_CODES
+
+
+_notion_retry = api_retry(_is_retryable)
+
+
 class NotionClient:
     """Client for interacting with Notion API."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Maximum number of pages fetched concurrently in export_sample_pages
+    MAX_CONCURRENT_REQUESTS = 10
+
+    # Largest page size accepted by blocks.children.list
+    BLOCKS_PAGE_SIZE = 100
+
+    # Common title property names, in lookup order
+    _TITLE_KEYS = ("Name", "Title", "title", "name")
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[CloudStorageCache] = None
+    ):
         """
         Initialize Notion client.
 
         Args:
             api_key: Notion integration token. If not provided, reads from NOTION_API_KEY env var.
+            cache: Optional cache for page content, keyed by page ID and last_edited_time.
         """
         self.api_key = api_key or os.getenv("NOTION_API_KEY")
         if not self.api_key:
             raise ValueError("NOTION_API_KEY must be set")
 
+        # Imported here so importing this module does not load notion_client/httpx
+        from notion_client import Client
+
         self.client = Client(auth=self.api_key)
         self.database_id = os.getenv("NOTION_DATABASE_ID")
+        self.cache = cache
+
+    @_notion_retry
+    def _call_with_retry(self, method, **kwargs):
+        """
+        Call a Notion client method, retrying rate limits and transient server errors.
+
+        Args:
+            method: Bound Client API method.
+            **kwargs: Arguments for the API method.
+
+        Returns:
+            Notion API response.
+        """
+        return method(**kwargs)
+
+    @_notion_retry
+    async def _acall_with_retry(self, method, **kwargs):
+        """
+        Call an AsyncClient method, retrying rate limits and transient server errors.
+
+        Args:
+            method: Bound AsyncClient API method.
+            **kwargs: Arguments for the API method.
+
+        Returns:
+            Notion API response.
+        """
+        return await method(**kwargs)
 
     def test_connection(self) -> bool:
         """
@@ -35,7 +98,7 @@ class NotionClient:
         """
         try:
             # List users to test connection
-            self.client.users.list()
+            self._call_with_retry(self.client.users.list)
             logger.info("notion_connection_test_success")
             return True
         except Exception as e:
@@ -58,7 +121,8 @@ class NotionClient:
             List of page dictionaries.
         """
         try:
-            response = self.client.search(
+            response = self._call_with_retry(
+                self.client.search,
                 query=query,
                 page_size=page_size,
                 filter={"property": "object", "value": "page"}
@@ -82,23 +146,135 @@ class NotionClient:
         """
         try:
             # Get page metadata
-            page = self.client.pages.retrieve(page_id=page_id)
+            page = self._call_with_retry(self.client.pages.retrieve, page_id=page_id)
 
             # Get page blocks (content)
-            blocks_response = self.client.blocks.children.list(block_id=page_id)
-            blocks = blocks_response.get("results", [])
-
-            content = {
-                "page_id": page_id,
-                "title": self._extract_title(page),
-                "properties": page.get("properties", {}),
-                "blocks": blocks,
-                "created_time": page.get("created_time"),
-                "last_edited_time": page.get("last_edited_time")
-            }
+            blocks = list(self.iter_blocks(page_id))
 
             logger.info("notion_page_content_retrieved", page_id=page_id)
-            return content
+            return self._build_page_content(page, blocks)
+        except Exception as e:
+            logger.error("notion_page_content_failed", page_id=page_id, error=str(e))
+            return {}
+
+    def get_page_blocks_only(self, page_id: str) -> List[Dict]:
+        """
+        Retrieve the blocks of a page without re-fetching its metadata.
+
+        Use this when the page object is already at hand, e.g. from search_pages.
+
+        Args:
+            page_id: Notion page ID.
+
+        Returns:
+            List of block dictionaries.
+        """
+        try:
+            return list(self.iter_blocks(page_id))
+        except Exception as e:
+            logger.error("notion_page_blocks_failed", page_id=page_id, error=str(e))
+            return []
+
+    def _build_page_content(self, page: Dict, blocks: List[Dict]) -> Dict:
+        """
+        Combine a page object and its blocks into a content dictionary.
+
+        Args:
+            page: Page dictionary, as returned by pages.retrieve or search.
+            blocks: Block dictionaries of the page.
+
+        Returns:
+            Dictionary containing page metadata and blocks.
+        """
+        return {
+            "page_id": page["id"],
+            "title": self._extract_title(page),
+            "properties": page.get("properties", {}),
+            "blocks": blocks,
+            "created_time": page.get("created_time"),
+            "last_edited_time": page.get("last_edited_time")
+        }
+
+    def iter_blocks(self, block_id: str) -> Iterator[Dict]:
+        """
+        Iterate over all child blocks of a page or block, following pagination.
+
+        Args:
+            block_id: Page or block ID.
+
+        Yields:
+            Block dictionaries.
+        """
+        cursor = None
+        while True:
+            kwargs = {"block_id": block_id, "page_size": self.BLOCKS_PAGE_SIZE}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+
+            response = self._call_with_retry(self.client.blocks.children.list, **kwargs)
+            yield from response.get("results", [])
+
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                break
+
+    async def aget_blocks(self, aclient, block_id: str) -> List[Dict]:
+        """
+        Retrieve all child blocks of a page or block using the async client.
+
+        Args:
+            aclient: Open notion_client.AsyncClient.
+            block_id: Page or block ID.
+
+        Returns:
+            List of block dictionaries.
+        """
+        blocks = []
+        cursor = None
+        while True:
+            kwargs = {"block_id": block_id, "page_size": self.BLOCKS_PAGE_SIZE}
+            if cursor:
+                kwargs["start_cursor"] = cursor
+
+            response = await self._acall_with_retry(aclient.blocks.children.list, **kwargs)
+            blocks.extend(response.get("results", []))
+
+            cursor = response.get("next_cursor")
+            if not response.get("has_more") or not cursor:
+                return blocks
+
+    async def aget_page_content(
+        self,
+        aclient,
+        page_id: str,
+        page: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Retrieve page content including blocks using the async client.
+
+        The page metadata and block requests are issued concurrently. If the
+        page object is already known (e.g. from search_pages), only the blocks
+        are fetched.
+
+        Args:
+            aclient: Open notion_client.AsyncClient.
+            page_id: Notion page ID.
+            page: Optional page dictionary, to skip the pages.retrieve call.
+
+        Returns:
+            Dictionary containing page metadata and blocks.
+        """
+        try:
+            if page is None:
+                page, blocks = await asyncio.gather(
+                    self._acall_with_retry(aclient.pages.retrieve, page_id=page_id),
+                    self.aget_blocks(aclient, page_id)
+                )
+            else:
+                blocks = await self.aget_blocks(aclient, page_id)
+
+            logger.info("notion_page_content_retrieved", page_id=page_id)
+            return self._build_page_content(page, blocks)
         except Exception as e:
             logger.error("notion_page_content_failed", page_id=page_id, error=str(e))
             return {}
@@ -124,7 +300,8 @@ class NotionClient:
             return []
 
         try:
-            response = self.client.databases.query(
+            response = self._call_with_retry(
+                self.client.databases.query,
                 database_id=db_id,
                 page_size=page_size
             )
@@ -148,27 +325,27 @@ class NotionClient:
         properties = page.get("properties", {})
 
         # Try common title property names
-        for prop_name in ["Name", "Title", "title", "name"]:
-            if prop_name in properties:
-                title_prop = properties[prop_name]
-                if title_prop.get("type") == "title":
-                    title_array = title_prop.get("title", [])
-                    if title_array:
-                        return title_array[0].get("plain_text", "Untitled")
+        for prop_name in self._TITLE_KEYS:
+            title_prop = properties.get(prop_name)
+            if title_prop and title_prop.get("type") == "title":
+                title_array = title_prop.get("title")
+                if title_array:
+                    return title_array[0].get("plain_text", "Untitled")
 
         return "Untitled"
 
-    def _extract_text_from_blocks(self, blocks: List[Dict]) -> str:
+    def _extract_text_from_blocks(self, blocks: Iterable[Dict]) -> str:
         """
         Extract plain text from Notion blocks.
 
         Args:
-            blocks: List of block dictionaries.
+            blocks: Iterable of block dictionaries.
 
         Returns:
-            Combined plain text.
+            Combined plain text, one line per text fragment.
         """
-        text_parts = []
+        buf = io.StringIO()
+        separator = ""
 
         for block in blocks:
             block_type = block.get("type")
@@ -180,13 +357,17 @@ class NotionClient:
             # Extract text from rich text arrays
             if "rich_text" in block_content:
                 for text_obj in block_content["rich_text"]:
-                    text_parts.append(text_obj.get("plain_text", ""))
+                    buf.write(separator)
+                    buf.write(text_obj.get("plain_text", ""))
+                    separator = "\n"
 
             # Handle other block types
             elif "text" in block_content:
-                text_parts.append(block_content["text"])
+                buf.write(separator)
+                buf.write(block_content["text"])
+                separator = "\n"
 
-        return "\n".join(text_parts)
+        return buf.getvalue()
 
     def export_sample_pages(
         self,
@@ -203,31 +384,75 @@ class NotionClient:
         Returns:
             List of exported pages.
         """
-        import json
+        return asyncio.run(self.aexport_sample_pages(num_pages, output_file))
+
+    async def aexport_sample_pages(
+        self,
+        num_pages: int = 20,
+        output_file: str = "sample_notion_pages.json"
+    ) -> List[Dict]:
+        """
+        Export sample pages for data audit, fetching pages concurrently.
+
+        Each page is written as soon as its blocks are fetched, so pages
+        appear in the output in completion order.
+
+        The async client is opened for this run only, so it is closed when the
+        export finishes and never outlives the event loop it was created on.
+
+        Args:
+            num_pages: Number of pages to export.
+            output_file: Output file path.
+
+        Returns:
+            List of exported pages.
+        """
+        from notion_client import AsyncClient
 
         pages = self.search_pages(page_size=num_pages)
         exported_pages = []
 
-        for page in pages[:num_pages]:
-            page_id = page["id"]
-            content = self.get_page_content(page_id)
-
-            if content:
-                # Extract text from blocks
-                text_content = self._extract_text_from_blocks(content.get("blocks", []))
-
-                exported_pages.append({
-                    "page_id": page_id,
-                    "title": content.get("title", "Untitled"),
-                    "created_time": content.get("created_time"),
-                    "last_edited_time": content.get("last_edited_time"),
-                    "text_content": text_content,
-                    "block_count": len(content.get("blocks", []))
-                })
-
-        # Save to file
-        with open(output_file, "w") as f:
-            json.dump(exported_pages, f, indent=2)
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def fetch(page: Dict) -> Optional[Dict]:
+            # Pages unchanged since the last export are served from the cache
+            cache_key = None
+            content = None
+            if self.cache and page.get("last_edited_time"):
+                cache_key = f"notion:{page['id']}:{page['last_edited_time']}"
+                # Cache reads and writes are blocking file/GCS I/O, so they run off the event loop
+                content = await asyncio.to_thread(self.cache.get, cache_key)
+
+            if content is None:
+                # Search results already carry the page metadata, so only blocks are fetched
+                async with semaphore:
+                    content = await self.aget_page_content(aclient, page["id"], page=page)
+
+                if cache_key and content:
+                    await asyncio.to_thread(self.cache.set, cache_key, content)
+
+            if not content:
+                return None
+
+            # Reduce the page to its export record so the block tree can be freed
+            blocks = content.get("blocks", [])
+            return {
+                "page_id": page["id"],
+                "title": content.get("title", "Untitled"),
+                "created_time": content.get("created_time"),
+                "last_edited_time": content.get("last_edited_time"),
+                "text_content": self._extract_text_from_blocks(blocks),
+                "block_count": len(blocks)
+            }
+
+        # Write each page to file as soon as it is fetched
+        async with AsyncClient(auth=self.api_key) as aclient:
+            with JsonArrayWriter(output_file) as writer:
+                for next_page in asyncio.as_completed([fetch(page) for page in pages[:num_pages]]):
+                    exported_page = await next_page
+                    if exported_page:
+                        writer.write(exported_page)
+                        exported_pages.append(exported_page)
 
         logger.info(
             "notion_sample_export_complete",
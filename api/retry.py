@@ -0,0 +1,59 @@
+"""
+Retry policy shared by the API clients.
+"""
+from typing import Callable, Optional
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+import structlog
+
+logger = structlog.get_logger()
+
+# HTTP statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Total attempts per call, including the first one
+MAX_ATTEMPTS = 6
+
+_backoff = wait_random_exponential(multiplier=0.5, max=30)
+
+
+def _log_retry(retry_state) -> None:
+    """Log a failed attempt before sleeping."""
+    logger.warning(
+        "api_call_retrying",
+        attempt=retry_state.attempt_number,
+        error=str(retry_state.outcome.exception())
+    )
+
+
+def api_retry(
+    is_retryable: Callable[[BaseException], bool],
+    retry_after: Optional[Callable[[BaseException], Optional[float]]] = None
+):
+    """
+    Build a retry decorator with jittered exponential backoff.
+
+    Works on both regular functions and coroutines. Once attempts are
+    exhausted, the last exception is re-raised to the caller.
+
+    Args:
+        is_retryable: Returns True if an exception is transient.
+        retry_after: Returns the delay requested by the server for an exception
+                     (e.g. from a Retry-After header), or None to use the backoff.
+
+    Returns:
+        Retry decorator.
+    """
+    def wait(retry_state) -> float:
+        if retry_after is not None:
+            delay = retry_after(retry_state.outcome.exception())
+            if delay is not None:
+                return delay
+        return _backoff(retry_state)
+
+    return retry(
+        retry=retry_if_exception(is_retryable),
+        wait=wait,
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        before_sleep=_log_retry,
+        reraise=True
+    )
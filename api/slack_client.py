@@ -2,18 +2,47 @@
 Slack API client for message retrieval and bot interactions.
 """
 import os
+import time
+import asyncio
+import threading
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 import structlog
 
+from api.json_export import JsonArrayWriter
+from api.retry import RETRYABLE_STATUS_CODES, api_retry
+
 logger = structlog.get_logger()
 
 
+def _is_retryable(exc: BaseException) -> bool:
+    """Check whether a Slack API error is transient."""
+    return isinstance(exc, SlackApiError) and exc.response.status_code in RETRYABLE_STATUS_CODES
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Get the delay Slack asked for on a rate-limited response."""
+    retry_after = exc.response.headers.get("Retry-After")
+    return float(retry_after) if retry_after else None
+
+
+_slack_retry = api_retry(_is_retryable, retry_after=_retry_after)
+
+
 class SlackClient:
     """Client for interacting with Slack API."""
 
+    # Maximum number of concurrent requests in async bulk retrieval
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # Messages requested per conversations.history page (Slack recommends <= 200)
+    HISTORY_PAGE_SIZE = 200
+
+    # Minimum spacing between posts to one channel (Slack allows ~1 message/sec)
+    MIN_POST_INTERVAL_SECONDS = 1.0
+
     def __init__(self, token: Optional[str] = None):
         """
         Initialize Slack client.
@@ -26,8 +55,24 @@ class SlackClient:
             raise ValueError("SLACK_BOT_TOKEN must be set")
 
         self.client = WebClient(token=self.token)
+        self._aclient = None
         self.workspace_id = os.getenv("SLACK_WORKSPACE_ID")
 
+        # User info keyed by user ID, filled by get_user_info and load_users
+        self._user_cache: Dict[str, Dict] = {}
+
+        # Next free posting slot per channel, for the post_message throttle
+        self._next_post_at: Dict[str, float] = {}
+        self._post_lock = threading.Lock()
+
+    @property
+    def aclient(self):
+        """Async Slack client, created on first use (it pulls in aiohttp)."""
+        if self._aclient is None:
+            from slack_sdk.web.async_client import AsyncWebClient
+            self._aclient = AsyncWebClient(token=self.token)
+        return self._aclient
+
     def test_connection(self) -> bool:
         """
         Test Slack API connection.
@@ -36,7 +81,7 @@ class SlackClient:
             True if connection successful, False otherwise.
         """
         try:
-            response = self.client.auth_test()
+            response = self._call_with_retry(self.client.auth_test)
             logger.info("slack_connection_test_success", team=response["team"])
             return True
         except SlackApiError as e:
@@ -54,7 +99,8 @@ class SlackClient:
             List of channel dictionaries.
         """
         try:
-            response = self.client.conversations_list(
+            response = self._call_with_retry(
+                self.client.conversations_list,
                 limit=limit,
                 exclude_archived=True,
                 types="public_channel,private_channel"
@@ -86,13 +132,134 @@ class SlackClient:
         try:
             oldest = (datetime.now() - timedelta(days=days_back)).timestamp()
 
-            response = self.client.conversations_history(
+            messages = []
+            cursor = None
+            while len(messages) < limit:
+                response = self._call_with_retry(
+                    self.client.conversations_history,
+                    channel=channel_id,
+                    limit=min(self.HISTORY_PAGE_SIZE, limit - len(messages)),
+                    oldest=oldest,
+                    cursor=cursor
+                )
+                messages.extend(response["messages"])
+
+                cursor = (response.get("response_metadata") or {}).get("next_cursor")
+                if not cursor:
+                    break
+
+            logger.info(
+                "slack_messages_retrieved",
                 channel=channel_id,
-                limit=limit,
-                oldest=oldest
+                count=len(messages)
+            )
+            return messages
+        except SlackApiError as e:
+            logger.error(
+                "slack_messages_retrieval_failed",
+                channel=channel_id,
+                error=str(e)
             )
+            return []
+
+    def post_message(self, channel: str, text: str, **kwargs) -> Optional[Dict]:
+        """
+        Post a message, spacing posts to the same channel to stay under Slack's limit.
+
+        Args:
+            channel: Channel ID or name.
+            text: Message text.
+            **kwargs: Extra chat.postMessage arguments (e.g. mrkdwn, blocks).
+
+        Returns:
+            Slack API response, or None if posting failed.
+        """
+        # Reserve this channel's next slot under the lock, then wait outside it
+        with self._post_lock:
+            now = time.monotonic()
+            post_at = max(now, self._next_post_at.get(channel, now))
+            self._next_post_at[channel] = post_at + self.MIN_POST_INTERVAL_SECONDS
+        if post_at > now:
+            time.sleep(post_at - now)
+
+        try:
+            return self._call_with_retry(
+                self.client.chat_postMessage,
+                channel=channel,
+                text=text,
+                **kwargs
+            )
+        except SlackApiError as e:
+            logger.error("slack_post_message_failed", channel=channel, error=str(e))
+            return None
+
+    @_slack_retry
+    def _call_with_retry(self, method, **kwargs):
+        """
+        Call a WebClient method, retrying rate limits and transient server errors.
+
+        Rate-limited calls wait for Slack's Retry-After delay; other retries
+        use jittered exponential backoff.
+
+        Args:
+            method: Bound WebClient API method.
+            **kwargs: Arguments for the API method.
+
+        Returns:
+            Slack API response.
+        """
+        return method(**kwargs)
+
+    @_slack_retry
+    async def _acall_with_retry(self, method, **kwargs):
+        """
+        Call an AsyncWebClient method, retrying rate limits and transient server errors.
+
+        Args:
+            method: Bound AsyncWebClient API method.
+            **kwargs: Arguments for the API method.
+
+        Returns:
+            Slack API response.
+        """
+        return await method(**kwargs)
+
+    async def aget_messages(
+        self,
+        channel_id: str,
+        limit: int = 500,
+        days_back: int = 30
+    ) -> List[Dict]:
+        """
+        Retrieve messages from a channel using the async client.
+
+        Args:
+            channel_id: Channel ID to retrieve messages from.
+            limit: Maximum number of messages to retrieve.
+            days_back: Number of days to look back for messages.
+
+        Returns:
+            List of message dictionaries.
+        """
+        try:
+            oldest = (datetime.now() - timedelta(days=days_back)).timestamp()
+
+            messages = []
+            cursor = None
+            while len(messages) < limit:
+                response = await self._acall_with_retry(
+                    self.aclient.conversations_history,
+                    channel=channel_id,
+                    limit=min(self.HISTORY_PAGE_SIZE, limit - len(messages)),
+                    oldest=oldest,
+                    cursor=cursor
+                )
+                messages.extend(response["messages"])
+
+                cursor = (response.get("response_metadata") or {}).get("next_cursor")
+                if not cursor:
+                    break
 
-            messages = response["messages"]
             logger.info(
                 "slack_messages_retrieved",
                 channel=channel_id,
@@ -123,7 +290,8 @@ class SlackClient:
             List of reply message dictionaries.
         """
         try:
-            response = self.client.conversations_replies(
+            response = self._call_with_retry(
+                self.client.conversations_replies,
                 channel=channel_id,
                 ts=thread_ts
             )
@@ -154,13 +322,53 @@ class SlackClient:
         Returns:
             User info dictionary or None if not found.
         """
+        user = self._user_cache.get(user_id)
+        if user is not None:
+            return user
+
         try:
-            response = self.client.users_info(user=user_id)
-            return response["user"]
+            response = self._call_with_retry(self.client.users_info, user=user_id)
+            user = response["user"]
+            self._user_cache[user_id] = user
+            return user
         except SlackApiError as e:
             logger.error("slack_user_info_failed", user_id=user_id, error=str(e))
             return None
 
+    def load_users(self, limit: int = 200) -> int:
+        """
+        Populate the user info cache from users.list in bulk.
+
+        Useful before enriching many messages, so get_user_info only falls back
+        to users.info for users missing from the listing.
+
+        Args:
+            limit: Page size for each users.list call.
+
+        Returns:
+            Number of users cached.
+        """
+        try:
+            cursor = None
+            while True:
+                response = self._call_with_retry(
+                    self.client.users_list,
+                    limit=limit,
+                    cursor=cursor
+                )
+                for user in response["members"]:
+                    self._user_cache[user["id"]] = user
+
+                cursor = response.get("response_metadata", {}).get("next_cursor")
+                if not cursor:
+                    break
+
+            logger.info("slack_users_cached", count=len(self._user_cache))
+        except SlackApiError as e:
+            logger.error("slack_users_list_failed", error=str(e))
+
+        return len(self._user_cache)
+
     def export_sample_messages(
         self,
         num_messages: int = 500,
@@ -176,39 +384,67 @@ class SlackClient:
         Returns:
             List of exported messages.
         """
-        import json
+        return asyncio.run(self.aexport_sample_messages(num_messages, output_file))
+
+    async def aexport_sample_messages(
+        self,
+        num_messages: int = 500,
+        output_file: str = "sample_slack_messages.json"
+    ) -> List[Dict]:
+        """
+        Export sample messages for data audit, fetching channels concurrently.
+
+        Args:
+            num_messages: Number of messages to export.
+            output_file: Output file path.
 
+        Returns:
+            List of exported messages.
+        """
         all_messages = []
         channels = self.get_channels()
 
         messages_per_channel = max(1, num_messages // len(channels)) if channels else num_messages
 
-        for channel in channels:
-            if len(all_messages) >= num_messages:
-                break
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
 
-            messages = self.get_messages(
-                channel_id=channel["id"],
-                limit=messages_per_channel
-            )
+        async def fetch(channel: Dict) -> List[Dict]:
+            async with semaphore:
+                return await self.aget_messages(
+                    channel_id=channel["id"],
+                    limit=messages_per_channel
+                )
 
-            for msg in messages:
-                if len(all_messages) >= num_messages:
-                    break
+        # Fetch channel histories concurrently, but merge them in channel order
+        tasks = [asyncio.create_task(fetch(channel)) for channel in channels]
 
-                # Include basic metadata without PII exposure
-                all_messages.append({
-                    "channel_id": channel["id"],
-                    "channel_name": channel.get("name", "unknown"),
-                    "timestamp": msg.get("ts"),
-                    "text": msg.get("text", ""),
-                    "thread_ts": msg.get("thread_ts"),
-                    "user_id": msg.get("user", "unknown")
-                })
-
-        # Save to file
-        with open(output_file, "w") as f:
-            json.dump(all_messages, f, indent=2)
+        # Write each message to file as it is merged
+        try:
+            with JsonArrayWriter(output_file) as writer:
+                for channel, task in zip(channels, tasks):
+                    if len(all_messages) >= num_messages:
+                        break
+
+                    for msg in await task:
+                        if len(all_messages) >= num_messages:
+                            break
+
+                        # Include basic metadata without PII exposure
+                        message = {
+                            "channel_id": channel["id"],
+                            "channel_name": channel.get("name", "unknown"),
+                            "timestamp": msg.get("ts"),
+                            "text": msg.get("text", ""),
+                            "thread_ts": msg.get("thread_ts"),
+                            "user_id": msg.get("user", "unknown")
+                        }
+                        writer.write(message)
+                        all_messages.append(message)
+        finally:
+            # Drop any channel fetches that are no longer needed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         logger.info(
             "slack_sample_export_complete",
@@ -1,26 +1,62 @@
 """
 Token volume estimator for cost projection.
 """
+import os
 import json
-from typing import Dict, List
+import random
+import functools
+from typing import TYPE_CHECKING, Dict, List
 from pathlib import Path
-import tiktoken
 import structlog
 
+if TYPE_CHECKING:
+    import tiktoken
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = structlog.get_logger()
 
 
+@functools.lru_cache(maxsize=4)
+def _get_encoding(encoding_name: str) -> "tiktoken.Encoding":
+    """Load a tiktoken encoding once per process."""
+    # Imported here so PII-only audit runs never load tiktoken
+    import tiktoken
+
+    return tiktoken.get_encoding(encoding_name)
+
+
 class VolumeEstimator:
     """Estimates token volumes and costs for knowledge processing."""
 
-    def __init__(self, encoding_name: str = "cl100k_base"):
+    # Share of sample items tokenized exactly to calibrate the chars-per-token ratio
+    CALIBRATION_FRACTION = 0.1
+
+    # Sample sets up to this size are always tokenized exactly
+    MIN_CALIBRATION_ITEMS = 100
+
+    # Typical cl100k_base ratio for English, used if the calibration set has no tokens
+    DEFAULT_CHARS_PER_TOKEN = 4.0
+
+    def __init__(self, encoding_name: str = "cl100k_base", exact: bool = False):
         """
         Initialize volume estimator.
 
         Args:
             encoding_name: Tiktoken encoding to use (cl100k_base for GPT-4, GPT-3.5).
+            exact: Tokenize every sample item instead of extrapolating from a
+                   calibration subsample.
         """
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding = _get_encoding(encoding_name)
+        self.exact = exact
 
         # Pricing per 1M tokens (as of 2024)
         self.pricing = {
@@ -58,23 +94,26 @@ class VolumeEstimator:
         Returns:
             Dictionary with volume estimates.
         """
-        total_tokens = 0
-        item_count = 0
+        texts = []
 
         for file_path in sample_files:
             if not Path(file_path).exists():
                 logger.warning("sample_file_not_found", file_path=file_path)
                 continue
 
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with open(file_path, 'rb') as f:
+                if ijson is not None:
+                    # Stream top-level array items instead of loading the whole export
+                    texts.extend(self._extract_text(item) for item in ijson.items(f, 'item'))
+                    continue
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
 
             if isinstance(data, list):
-                for item in data:
-                    text = self._extract_text(item)
-                    tokens = self.count_tokens(text)
-                    total_tokens += tokens
-                    item_count += 1
+                texts.extend(self._extract_text(item) for item in data)
+
+        total_tokens = self._count_sample_tokens(texts)
+        item_count = len(texts)
 
         avg_tokens_per_item = total_tokens / item_count if item_count > 0 else 0
 
@@ -109,6 +148,41 @@ class VolumeEstimator:
 
         return estimates
 
+    def _count_sample_tokens(self, texts: List[str]) -> int:
+        """
+        Count the tokens in sample texts.
+
+        Unless exact is set, only a random calibration subsample is tokenized;
+        the remaining texts are estimated from their length using the
+        subsample's chars-per-token ratio. Cost projections are rounded to
+        cents, so this precision is sufficient.
+
+        Args:
+            texts: Sample texts.
+
+        Returns:
+            Total (estimated) token count.
+        """
+        if self.exact or len(texts) <= self.MIN_CALIBRATION_ITEMS:
+            calibration, rest = texts, []
+        else:
+            sample_size = max(self.MIN_CALIBRATION_ITEMS, int(len(texts) * self.CALIBRATION_FRACTION))
+            indices = set(random.sample(range(len(texts)), sample_size))
+            calibration = [text for i, text in enumerate(texts) if i in indices]
+            rest = [text for i, text in enumerate(texts) if i not in indices]
+
+        # Tokenize in one call; tiktoken spreads the batch over threads
+        token_lists = self.encoding.encode_ordinary_batch(calibration, num_threads=os.cpu_count() or 1)
+        calibration_tokens = sum(map(len, token_lists))
+        if not rest:
+            return calibration_tokens
+
+        calibration_chars = sum(map(len, calibration))
+        chars_per_token = (
+            calibration_chars / calibration_tokens if calibration_tokens else self.DEFAULT_CHARS_PER_TOKEN
+        )
+        return calibration_tokens + round(sum(map(len, rest)) / chars_per_token)
+
     def _extract_text(self, item: Dict) -> str:
         """
         Extract text content from item.
@@ -236,8 +310,11 @@ class VolumeEstimator:
             "recommendations": self._generate_recommendations(estimates, budget_check)
         }
 
-        with open(output_file, 'w') as f:
-            json.dump(report, f, indent=2)
+        with open(output_file, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+            else:
+                f.write(json.dumps(report, indent=2).encode("utf-8"))
 
         logger.info("volume_report_generated", output_file=output_file)
 
@@ -3,26 +3,42 @@ Slack bot for Knowledge Summarizer Agent.
 Handles /summarize commands and provides semantic search results.
 """
 import os
-from typing import List, Dict, Optional
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional
 import structlog
-import anthropic
 
 # Import our modules
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from processing.embedder import Embedder
-from storage.pinecone_store import PineconeStore
-
 logger = structlog.get_logger()
 
 
 class KnowledgeBot:
     """Slack bot for knowledge summarization and retrieval."""
-    
+
+    # Prompt for _generate_summary; filled in with the query and retrieved context
+    SUMMARY_PROMPT_TEMPLATE = """Based on the following knowledge base excerpts, provide a concise and helpful answer to the user's question.
+
+User Question: {query}
+
+Relevant Information:
+{context_text}
+
+Instructions:
+- Provide a direct, actionable answer
+- If multiple sources agree, synthesize them
+- If sources conflict, note the different perspectives
+- Keep the response concise (2-3 paragraphs max)
+- If the information doesn't fully answer the question, acknowledge that
+
+Answer:"""
+
+    # Minimum time between Slack message edits while a summary streams in
+    STREAM_UPDATE_INTERVAL_SECONDS = 1.0
+
     def __init__(
         self,
         slack_bot_token: Optional[str] = None,
@@ -44,6 +60,13 @@ class KnowledgeBot:
         if not all([self.slack_bot_token, self.slack_app_token, self.anthropic_api_key]):
             raise ValueError("Missing required API tokens")
         
+        # Imported here so importing this module does not load the Slack, Anthropic,
+        # OpenAI and Pinecone SDKs
+        import anthropic
+        from slack_bolt import App
+        from processing.embedder import Embedder
+        from storage.pinecone_store import PineconeStore
+
         # Initialize Slack app
         self.app = App(token=self.slack_bot_token)
         
@@ -51,6 +74,9 @@ class KnowledgeBot:
         self.embedder = Embedder()
         self.vector_store = PineconeStore()
         self.claude = anthropic.Anthropic(api_key=self.anthropic_api_key)
+
+        # Runs Slack posts that can overlap with query work
+        self._executor = ThreadPoolExecutor(max_workers=4)
         
         # Register command handlers
         self._register_handlers()
@@ -78,12 +104,15 @@ class KnowledgeBot:
                 say("❌ Please provide a search query. Example: `/summarize onboarding process`")
                 return
             
-            # Show loading message
-            say(f"🔍 Searching for: *{query_text}*...")
+            # Show loading message while the query is embedded
+            loading = self._executor.submit(say, f"🔍 Searching for: *{query_text}*...")
             
             try:
                 # Generate query embedding
                 embedding_result = self.embedder.embed_text(query_text)
+
+                # Later replies must come after the loading message
+                loading.result()
                 
                 if not embedding_result:
                     say("❌ Failed to process query. Please try again.")
@@ -114,12 +143,29 @@ class KnowledgeBot:
                                 "timestamp": metadata.get("timestamp")
                             })
                 
+                # Post a placeholder and fill it in as Claude streams the summary
+                placeholder = say("✍️ Summarizing...")
+
+                def show_partial(text: str) -> None:
+                    try:
+                        self.app.client.chat_update(
+                            channel=placeholder["channel"],
+                            ts=placeholder["ts"],
+                            text=text
+                        )
+                    except Exception as e:
+                        logger.warning("summary_partial_update_failed", error=str(e))
+
                 # Generate summary with Claude
-                summary = self._generate_summary(query_text, context_chunks)
+                summary = self._generate_summary(query_text, context_chunks, on_text=show_partial)
                 
                 # Format response
                 response = self._format_response(query_text, summary, context_chunks)
-                say(response)
+                self.app.client.chat_update(
+                    channel=placeholder["channel"],
+                    ts=placeholder["ts"],
+                    text=response
+                )
                 
                 logger.info(
                     "summarize_command_completed",
@@ -147,14 +193,17 @@ class KnowledgeBot:
     def _generate_summary(
         self,
         query: str,
-        context_chunks: List[Dict]
+        context_chunks: List[Dict],
+        on_text: Optional[Callable[[str], None]] = None
     ) -> str:
         """
-        Generate summary using Claude.
+        Generate summary using Claude, streaming the response.
         
         Args:
             query: User query
             context_chunks: Retrieved context chunks
+            on_text: Called with the summary so far as it streams in, at most
+                     once per STREAM_UPDATE_INTERVAL_SECONDS
             
         Returns:
             Generated summary
@@ -168,33 +217,27 @@ class KnowledgeBot:
             for chunk in context_chunks[:5]
         ])
         
-        prompt = f"""Based on the following knowledge base excerpts, provide a concise and helpful answer to the user's question.
-
-User Question: {query}
-
-Relevant Information:
-{context_text}
-
-Instructions:
-- Provide a direct, actionable answer
-- If multiple sources agree, synthesize them
-- If sources conflict, note the different perspectives
-- Keep the response concise (2-3 paragraphs max)
-- If the information doesn't fully answer the question, acknowledge that
-
-Answer:"""
+        prompt = self.SUMMARY_PROMPT_TEMPLATE.format(query=query, context_text=context_text)
         
         try:
-            message = self.claude.messages.create(
+            summary_parts = []
+            last_update = time.monotonic()
+
+            with self.claude.messages.stream(
                 model="claude-3-haiku-20240307",
                 max_tokens=500,
                 messages=[{
                     "role": "user",
                     "content": prompt
                 }]
-            )
-            
-            summary = message.content[0].text
+            ) as stream:
+                for text in stream.text_stream:
+                    summary_parts.append(text)
+                    if on_text and time.monotonic() - last_update >= self.STREAM_UPDATE_INTERVAL_SECONDS:
+                        on_text("".join(summary_parts))
+                        last_update = time.monotonic()
+
+            summary = "".join(summary_parts)
             
             logger.info("summary_generated", model="claude-3-haiku")
             return summary
@@ -239,6 +282,8 @@ Answer:"""
     
     def start(self):
         """Start the bot in socket mode."""
+        from slack_bolt.adapter.socket_mode import SocketModeHandler
+
         logger.info("starting_knowledge_bot")
         handler = SocketModeHandler(self.app, self.slack_app_token)
         handler.start()
@@ -1,14 +1,25 @@
 # Weekly Digest Generator
 # Triggered by Cloud Scheduler to generate and post weekly knowledge summaries
 
+import io
 import os
+import sys
 import json
+from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict
 import anthropic
-from slack_sdk import WebClient
 import structlog
 
+# Make the repo packages importable; guarded so reloads don't grow sys.path
+_ROOT = str(Path(__file__).parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from api.slack_client import SlackClient
+from processing.embedder import Embedder
+from storage.pinecone_store import PineconeStore
+
 logger = structlog.get_logger()
 
 
@@ -22,25 +33,18 @@ def generate_weekly_digest(event, context):
         context: Event context
     """
     try:
-        import sys
-        from pathlib import Path
-        sys.path.insert(0, str(Path(__file__).parent.parent))
-        
-        from storage.pinecone_store import PineconeStore
-        
         logger.info("weekly_digest_generation_started")
         
         # Initialize services
         vector_store = PineconeStore()
         claude_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-        slack_client = WebClient(token=os.getenv("SLACK_BOT_TOKEN"))
+        slack_client = SlackClient()
         
         # Get stats from past week
         stats = vector_store.get_index_stats()
         
         # Query for recent high-relevance content across all namespaces
         # Using a generic "updates" query to find recent content
-        from processing.embedder import Embedder
         embedder = Embedder()
         
         query_embedding = embedder.embed_text("important updates and changes")
@@ -73,12 +77,16 @@ def generate_weekly_digest(event, context):
         # Format and post to Slack
         slack_message = _format_digest_message(digest_text, stats)
         
-        response = slack_client.chat_postMessage(
+        # Paced and retried (honoring Retry-After) by SlackClient
+        response = slack_client.post_message(
             channel=os.getenv("SLACK_GENERAL_CHANNEL", "#general"),
             text=slack_message,
             mrkdwn=True
         )
         
+        if response is None:
+            return {"status": "error", "message": "Failed to post digest to Slack"}
+        
         logger.info(
             "weekly_digest_posted",
             channel=response["channel"],
@@ -98,10 +106,14 @@ def _generate_digest_summary(
 ) -> str:
     """Generate weekly digest summary using Claude."""
     
-    context = "\n\n".join([
-        f"Source: {piece['source']}\nDate: {piece.get('timestamp', 'N/A')}\nContent: {piece['content'][:300]}"
-        for piece in content_pieces[:10]
-    ])
+    # Write pieces straight into one buffer instead of joining formatted copies
+    buf = io.StringIO()
+    for i, piece in enumerate(content_pieces[:10]):
+        if i:
+            buf.write("\n\n")
+        buf.write(f"Source: {piece['source']}\nDate: {piece.get('timestamp', 'N/A')}\nContent: ")
+        buf.write(piece['content'][:300])
+    context = buf.getvalue()
     
     prompt = f"""Based on the following knowledge base updates from the past week, create a concise weekly digest highlighting the top 5 most important updates or themes.
 
@@ -2,6 +2,157 @@
 GCP Cloud Functions for Knowledge Summarizer Agent.
 These functions handle ingestion, embedding, and query processing.
 """
+import asyncio
+import base64
+import json
+import os
+import sys
+from pathlib import Path
+
+# Make the repo packages importable; guarded so reloads don't grow sys.path
+_ROOT = str(Path(__file__).parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+import structlog
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from processing.chunker import ContentChunker
+from processing.pii_redactor import PIIRedactor
+from processing.embedder import Embedder
+from storage.cache_manager import CloudStorageCache
+from storage.pinecone_store import PineconeStore
+
+# Render JSON with orjson straight to bytes when available, and cache each
+# logger's processor chain after first use instead of rebuilding it per call
+structlog.configure(
+    processors=[
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.add_log_level,
+        structlog.processors.JSONRenderer(serializer=orjson.dumps)
+        if orjson is not None else structlog.processors.JSONRenderer()
+    ],
+    logger_factory=(
+        structlog.BytesLoggerFactory()
+        if orjson is not None else structlog.PrintLoggerFactory()
+    ),
+    cache_logger_on_first_use=True
+)
+
+logger = structlog.get_logger()
+
+# Components are created on first use and kept at module scope, so warm
+# invocations on the same instance reuse the clients and tokenizer
+_chunker = None
+_embedder = None
+_vector_store = None
+
+# Cloud Functions only allow writes under /tmp
+EMBEDDING_CACHE_DIR = "/tmp/embedding_cache"
+
+# /tmp is in-memory and counts against instance RAM; at ~2 KB per entry
+# this caps the embedding cache at roughly 10 MB
+EMBEDDING_CACHE_MAX_ENTRIES = 5000
+
+# Chunks per embed/upsert step in the ingestion pipeline (matches the upsert batch)
+INGEST_BATCH_SIZE = 100
+
+
+def _get_chunker():
+    """Return the instance-wide ContentChunker, creating it on first use."""
+    global _chunker
+    if _chunker is None:
+        _chunker = ContentChunker()
+    return _chunker
+
+
+def _get_embedder():
+    """Return the instance-wide Embedder, creating it on first use."""
+    global _embedder
+    if _embedder is None:
+        cache_dir = os.getenv("EMBEDDING_CACHE_DIR", EMBEDDING_CACHE_DIR)
+        max_entries = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", EMBEDDING_CACHE_MAX_ENTRIES))
+        _embedder = Embedder(cache=CloudStorageCache(cache_dir=cache_dir, max_entries=max_entries))
+    return _embedder
+
+
+def _get_vector_store():
+    """Return the instance-wide PineconeStore, creating it on first use."""
+    global _vector_store
+    if _vector_store is None:
+        _vector_store = PineconeStore()
+    return _vector_store
+
+
+async def _embed_and_upsert(chunks, source, source_id, embedder, vector_store):
+    """
+    Embed and upsert chunks as a two-stage pipeline.
+    
+    Batch N is upserted while batch N+1 is being embedded, so the two
+    network-bound stages overlap instead of running back to back.
+    
+    Args:
+        chunks: Chunks to index
+        source: Source type (slack, notion, drive)
+        source_id: Unique identifier from source
+        embedder: Embedder instance
+        vector_store: PineconeStore instance
+        
+    Returns:
+        Number of vectors upserted
+    """
+    namespace = vector_store.NAMESPACES.get(source, "default")
+    id_prefix = f"{source}-{source_id}-"
+    # One embedded batch may wait while the previous one is upserted
+    embedded = asyncio.Queue(maxsize=1)
+    
+    async def embed_stage():
+        for i in range(0, len(chunks), INGEST_BATCH_SIZE):
+            batch = chunks[i:i + INGEST_BATCH_SIZE]
+            results = await asyncio.to_thread(
+                embedder.embed_batch, [chunk.content for chunk in batch]
+            )
+            await embedded.put((batch, results))
+        await embedded.put(None)
+    
+    async def upsert_stage():
+        upserted = 0
+        while (item := await embedded.get()) is not None:
+            batch, results = item
+            embedded_pairs = [
+                (chunk, embedding_result)
+                for chunk, embedding_result in zip(batch, results)
+                if embedding_result
+            ]
+            vectors = [embedding_result.vector for _, embedding_result in embedded_pairs]
+            ids = [id_prefix + str(chunk.chunk_index) for chunk, _ in embedded_pairs]
+            chunk_metadata = [
+                {
+                    **chunk.metadata,
+                    "content": chunk.content[:1000],  # Store preview
+                    "model": embedding_result.model
+                }
+                for chunk, embedding_result in embedded_pairs
+            ]
+            
+            if vectors:
+                result = await asyncio.to_thread(
+                    vector_store.upsert_vectors,
+                    vectors=vectors,
+                    ids=ids,
+                    metadata=chunk_metadata,
+                    namespace=namespace
+                )
+                upserted += result.get("upserted_count", 0)
+        return upserted
+    
+    _, upserted = await asyncio.gather(embed_stage(), upsert_stage())
+    return upserted
+
 
 # Ingest Function - triggers on Pub/Sub messages from Slack/Notion/Drive
 def ingest_function(event, context):
@@ -12,40 +163,29 @@ def ingest_function(event, context):
         event: Pub/Sub event data
         context: Event context
     """
-    import base64
-    import json
-    import os
-    import sys
-    from pathlib import Path
-    
-    # Add parent directory to path
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    
-    from processing.chunker import ContentChunker
-    from processing.pii_redactor import PIIRedactor
-    from processing.embedder import Embedder
-    from storage.pinecone_store import PineconeStore
-    import structlog
-    
-    logger = structlog.get_logger()
-    
     try:
         # Decode Pub/Sub message
         pubsub_message = base64.b64decode(event['data']).decode('utf-8')
         message_data = json.loads(pubsub_message)
         
-        logger.info("ingestion_started", source=message_data.get("source"))
-        
         # Extract data
         source = message_data.get("source")  # slack, notion, or drive
         content = message_data.get("content")
         metadata = message_data.get("metadata", {})
         
+        # Bind the request context once for every event below
+        log = logger.bind(
+            source=source,
+            source_id=metadata.get("id"),
+            event_id=getattr(context, "event_id", None)
+        )
+        log.info("ingestion_started")
+        
         # Initialize components
-        chunker = ContentChunker()
+        chunker = _get_chunker()
         redactor = PIIRedactor(enabled=True)
-        embedder = Embedder()
-        vector_store = PineconeStore()
+        embedder = _get_embedder()
+        vector_store = _get_vector_store()
         
         # Redact PII
         redaction_result = redactor.redact(content)
@@ -62,46 +202,26 @@ def ingest_function(event, context):
             additional_metadata=metadata
         )
         
-        # Generate embeddings
-        texts = [chunk.content for chunk in chunks]
-        embedding_results = embedder.embed_batch(texts)
-        
-        # Prepare for Pinecone
-        vectors = []
-        ids = []
-        chunk_metadata = []
+        # Generate embeddings and upsert to Pinecone, overlapping the two
+        upserted = asyncio.run(_embed_and_upsert(
+            chunks,
+            source=source,
+            source_id=metadata.get("id"),
+            embedder=embedder,
+            vector_store=vector_store
+        ))
         
-        for chunk, embedding_result in zip(chunks, embedding_results):
-            if embedding_result:
-                vectors.append(embedding_result.vector)
-                ids.append(f"{source}-{metadata.get('id')}-{chunk.chunk_index}")
-                chunk_metadata.append({
-                    **chunk.metadata,
-                    "content": chunk.content[:1000],  # Store preview
-                    "model": embedding_result.model
-                })
-        
-        # Upsert to Pinecone
-        if vectors:
-            namespace = vector_store.NAMESPACES.get(source, "default")
-            result = vector_store.upsert_vectors(
-                vectors=vectors,
-                ids=ids,
-                metadata=chunk_metadata,
-                namespace=namespace
-            )
-            
-            logger.info(
+        if upserted:
+            log.info(
                 "ingestion_completed",
-                source=source,
                 chunks=len(chunks),
-                vectors_upserted=result.get("upserted_count", 0)
+                vectors_upserted=upserted
             )
         
         return {"status": "success", "chunks_processed": len(chunks)}
         
     except Exception as e:
-        logger.error("ingestion_failed", error=str(e))
+        logger.error("ingestion_failed", event_id=getattr(context, "event_id", None), error=str(e))
         return {"status": "error", "message": str(e)}
 
 
@@ -116,18 +236,6 @@ def embed_function(request):
     Returns:
         JSON response with embeddings
     """
-    import json
-    import os
-    import sys
-    from pathlib import Path
-    
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    
-    from processing.embedder import Embedder
-    import structlog
-    
-    logger = structlog.get_logger()
-    
     try:
         request_json = request.get_json()
         texts = request_json.get("texts", [])
@@ -135,12 +243,12 @@ def embed_function(request):
         if not texts:
             return {"error": "No texts provided"}, 400
         
-        embedder = Embedder()
+        embedder = _get_embedder()
         results = embedder.embed_batch(texts)
         
         embeddings = [
             {
-                "vector": result.vector if result else None,
+                "vector": result.vector.tolist() if result else None,
                 "token_count": result.token_count if result else 0,
                 "cost_usd": result.cost_usd if result else 0
             }
@@ -170,19 +278,6 @@ def query_function(request):
     Returns:
         JSON response with search results
     """
-    import json
-    import os
-    import sys
-    from pathlib import Path
-    
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    
-    from processing.embedder import Embedder
-    from storage.pinecone_store import PineconeStore
-    import structlog
-    
-    logger = structlog.get_logger()
-    
     try:
         request_json = request.get_json()
         query_text = request_json.get("query")
@@ -193,15 +288,29 @@ def query_function(request):
             return {"error": "No query provided"}, 400
         
         # Generate query embedding
-        embedder = Embedder()
+        embedder = _get_embedder()
         embedding_result = embedder.embed_text(query_text)
         
         if not embedding_result:
             return {"error": "Failed to generate embedding"}, 500
         
-        # Search Pinecone
-        vector_store = PineconeStore()
+        vector_store = _get_vector_store()
+        
+        # Serve near-duplicate queries from the semantic cache
+        cache_params = {"namespace": namespace, "top_k": top_k}
+        cached_results = vector_store.get_cached_response(
+            vector=embedding_result.vector,
+            cache_filter=cache_params
+        )
+        if cached_results is not None:
+            return {
+                "query": query_text,
+                "results": cached_results,
+                "token_count": embedding_result.token_count,
+                "cached": True
+            }
         
+        # Search Pinecone
         if namespace == "all":
             results = vector_store.query_all_namespaces(
                 vector=embedding_result.vector,
@@ -216,6 +325,15 @@ def query_function(request):
                 )
             }
         
+        # Empty results may be transient query failures, so don't cache them
+        if any(results.values()):
+            vector_store.cache_response(
+                query_text=query_text,
+                vector=embedding_result.vector,
+                response=results,
+                cache_metadata=cache_params
+            )
+        
         return {
             "query": query_text,
             "results": results,
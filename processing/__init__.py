@@ -4,8 +4,8 @@ Processing module for Knowledge Summarizer Agent.
 This module handles content chunking, PII redaction, and embedding generation.
 """
 
-from .chunker import Chunker
+from .chunker import Chunk, ContentChunker
 from .pii_redactor import PIIRedactor
 from .embedder import Embedder
 
-__all__ = ["Chunker", "PIIRedactor", "Embedder"]
+__all__ = ["Chunk", "ContentChunker", "PIIRedactor", "Embedder"]
@@ -1,14 +1,22 @@
 """
 Content chunking module for splitting documents into embeddable segments.
 """
+import os
+import functools
 import tiktoken
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass
 import structlog
 
 logger = structlog.get_logger()
 
 
+@functools.lru_cache(maxsize=4)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process."""
+    return tiktoken.get_encoding(encoding_name)
+
+
 @dataclass
 class Chunk:
     """Represents a chunk of content with metadata."""
@@ -18,6 +26,30 @@ class Chunk:
     chunk_index: int
 
 
+def _chunk_spans(total_tokens: int, chunk_size: int, overlap_size: int) -> List[Tuple[int, int]]:
+    """
+    Compute (start, end) token spans for overlapping chunks.
+    
+    The chunk count is worked out up front, so spans come from a plain
+    range instead of a loop that checks for the end of the text.
+    
+    Args:
+        total_tokens: Number of tokens in the text
+        chunk_size: Tokens per chunk
+        overlap_size: Tokens shared by consecutive chunks
+        
+    Returns:
+        List of (start, end) token offsets; the last span ends at total_tokens
+    """
+    # Always advance by at least one token, even if overlap >= chunk_size
+    step = max(chunk_size - overlap_size, 1)
+    num_chunks = 1 + max(0, -(-(total_tokens - chunk_size) // step))
+    return [
+        (start, min(start + chunk_size, total_tokens))
+        for start in range(0, num_chunks * step, step)
+    ]
+
+
 class ContentChunker:
     """Chunks content into token-sized segments with overlap."""
     
@@ -37,7 +69,7 @@ class ContentChunker:
         """
         self.chunk_size = chunk_size
         self.overlap_size = overlap_size
-        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.encoding = _get_encoding(encoding_name)
         
     def count_tokens(self, text: str) -> int:
         """Count tokens in text."""
@@ -77,44 +109,30 @@ class ContentChunker:
                 chunk_index=0
             )]
         
-        chunks = []
-        start_idx = 0
-        chunk_idx = 0
+        # Work out token spans first so every chunk decodes in one batch call
+        spans = _chunk_spans(total_tokens, self.chunk_size, self.overlap_size)
         
-        while start_idx < total_tokens:
-            # Calculate end index for this chunk
-            end_idx = min(start_idx + self.chunk_size, total_tokens)
-            
-            # Extract chunk tokens and decode
-            chunk_tokens = tokens[start_idx:end_idx]
-            chunk_text = self.encoding.decode(chunk_tokens)
-            
+        chunk_texts = self.encoding.decode_batch(
+            [tokens[start:end] for start, end in spans],
+            num_threads=os.cpu_count() or 1
+        )
+        
+        chunks = []
+        for chunk_idx, ((start_idx, end_idx), chunk_text) in enumerate(zip(spans, chunk_texts)):
             # Create chunk with metadata
             chunk = Chunk(
                 content=chunk_text,
                 metadata={
                     **metadata,
                     "chunk_index": chunk_idx,
-                    "total_chunks": None,  # Will be set after all chunks created
+                    "total_chunks": len(spans),
                     "start_token": start_idx,
                     "end_token": end_idx
                 },
-                token_count=len(chunk_tokens),
+                token_count=end_idx - start_idx,
                 chunk_index=chunk_idx
             )
             chunks.append(chunk)
-            
-            # Move start index forward (with overlap)
-            start_idx = end_idx - self.overlap_size
-            chunk_idx += 1
-            
-            # Prevent infinite loop if overlap >= chunk_size
-            if start_idx >= total_tokens:
-                break
-        
-        # Update total_chunks in metadata
-        for chunk in chunks:
-            chunk.metadata["total_chunks"] = len(chunks)
         
         logger.info(
             "text_chunked",
@@ -2,21 +2,63 @@
 Embedding generation module using OpenAI API.
 """
 import os
-from typing import List, Dict, Any, Optional
+import base64
+import hashlib
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import httpx
 import openai
 from openai import OpenAI
 import structlog
 import tiktoken
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
+from storage.cache_manager import CloudStorageCache
 
 logger = structlog.get_logger()
 
 
+@functools.lru_cache(maxsize=4)
+def _get_encoding(encoding_name: str) -> tiktoken.Encoding:
+    """Load a tiktoken encoding once per process."""
+    return tiktoken.get_encoding(encoding_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """
+    Shared keep-alive HTTP client for OpenAI calls.
+    
+    One pool per process lets concurrent embed_batch requests and later
+    invocations reuse open connections instead of paying a TLS handshake each.
+    HTTP/2 multiplexing is used when the h2 package is installed.
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    
+    return httpx.Client(
+        http2=http2,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+
+
+def _normalize(vector: np.ndarray) -> np.ndarray:
+    """Scale a vector to unit length in place, so dot product equals cosine."""
+    vector /= np.linalg.norm(vector) + 1e-12
+    return vector
+
+
 @dataclass
 class EmbeddingResult:
     """Result of embedding generation."""
-    vector: List[float]
+    vector: np.ndarray  # float32, unit length
     model: str
     token_count: int
     cost_usd: float
@@ -32,12 +74,20 @@ class Embedder:
         "text-embedding-ada-002": 0.10,  # $0.10 per 1M tokens (legacy)
     }
     
+    # Maximum embedding requests in flight at once during embed_batch
+    MAX_CONCURRENT_REQUESTS = 8
+    
+    # While less than this share of the budget is spent, embed_text skips the
+    # local token estimate; one text can't cost anywhere near the remainder
+    ESTIMATE_SKIP_BUDGET_FRACTION = 0.5
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "text-embedding-3-small",
-        batch_size: int = 100,
-        monthly_budget_usd: float = 100.0
+        batch_size: int = 512,
+        monthly_budget_usd: float = 100.0,
+        cache: Optional[CloudStorageCache] = None
     ):
         """
         Initialize embedder.
@@ -47,20 +97,23 @@ class Embedder:
             model: Embedding model to use
             batch_size: Number of texts to embed per API call
             monthly_budget_usd: Monthly budget cap in USD
+            cache: Optional embedding cache, keyed by model and text hash
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY must be set")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(api_key=self.api_key, http_client=_get_http_client())
         self.model = model
         self.batch_size = batch_size
         self.monthly_budget_usd = monthly_budget_usd
+        self.cache = cache
         
         # Cost tracking
         self.total_tokens_used = 0
         self.total_cost_usd = 0.0
-        self.encoding = tiktoken.get_encoding("cl100k_base")
+        self._cost_lock = threading.Lock()
+        self.encoding = _get_encoding("cl100k_base")
         
     def estimate_cost(self, text: str) -> float:
         """
@@ -76,6 +129,94 @@ class Embedder:
         cost_per_token = self.COSTS.get(self.model, 0.02) / 1_000_000
         return tokens * cost_per_token
     
+    def _count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many texts in one parallel tokenizer call.
+        
+        Args:
+            texts: Texts to count
+            
+        Returns:
+            Token count for each text
+        """
+        encoded = self.encoding.encode_batch(texts, num_threads=os.cpu_count() or 4)
+        return [len(tokens) for tokens in encoded]
+    
+    def _cache_key(self, text: str) -> str:
+        """Build the cache key for a text's embedding under the current model."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"embedding:{self.model}:{text_hash}"
+    
+    def _get_cached(self, text: str) -> Optional[EmbeddingResult]:
+        """
+        Look up a previously generated embedding.
+        
+        Args:
+            text: Text that was embedded
+            
+        Returns:
+            EmbeddingResult with zero cost, or None if not cached
+        """
+        if self.cache is None:
+            return None
+        
+        cached = self.cache.get(self._cache_key(text))
+        if not cached:
+            return None
+        
+        # Served without an API call, so no cost is incurred
+        return EmbeddingResult(
+            vector=_normalize(self.dequantize_int8(base64.b64decode(cached["q"]), cached["scale"])),
+            model=self.model,
+            token_count=cached["token_count"],
+            cost_usd=0.0
+        )
+    
+    def _set_cached(self, text: str, vector: List[float], token_count: int):
+        """Store an embedding in the cache, if one is configured."""
+        if self.cache is None:
+            return
+        
+        quantized, scale = self.quantize_int8(vector)
+        self.cache.set(self._cache_key(text), {
+            "q": base64.b64encode(quantized).decode("ascii"),
+            "scale": scale,
+            "token_count": token_count
+        })
+    
+    @staticmethod
+    def quantize_int8(vector: List[float]) -> Tuple[bytes, float]:
+        """
+        Scalar-quantize a vector to int8 with one scale per vector.
+        
+        Args:
+            vector: Embedding vector
+            
+        Returns:
+            Tuple of (int8 bytes, scale)
+        """
+        values = np.asarray(vector, dtype=np.float32)
+        scale = float(np.abs(values).max()) / 127 or 1.0
+        return np.round(values / scale).astype(np.int8).tobytes(), scale
+    
+    @staticmethod
+    def dequantize_int8(data: bytes, scale: float) -> np.ndarray:
+        """
+        Restore an approximate float vector from quantize_int8 output.
+        
+        Args:
+            data: int8 bytes
+            scale: Scale returned by quantize_int8
+            
+        Returns:
+            float32 embedding vector
+        """
+        return np.frombuffer(data, dtype=np.int8).astype(np.float32) * np.float32(scale)
+    
+    def _budget_slack(self) -> float:
+        """Budget remaining this month, in USD."""
+        return self.monthly_budget_usd - self.total_cost_usd
+    
     def check_budget(self, estimated_cost: float) -> bool:
         """
         Check if operation is within budget.
@@ -122,11 +263,16 @@ class Embedder:
             logger.warning("empty_text_for_embedding")
             return None
         
-        # Pre-flight cost check
-        estimated_cost = self.estimate_cost(text)
-        if not self.check_budget(estimated_cost):
-            logger.error("embedding_halted_budget_exceeded")
-            return None
+        cached = self._get_cached(text)
+        if cached:
+            return cached
+        
+        # Pre-flight cost check, only once spend is high enough to matter
+        if self._budget_slack() <= self.monthly_budget_usd * (1 - self.ESTIMATE_SKIP_BUDGET_FRACTION):
+            estimated_cost = self.estimate_cost(text)
+            if not self.check_budget(estimated_cost):
+                logger.error("embedding_halted_budget_exceeded")
+                return None
         
         try:
             response = self.client.embeddings.create(
@@ -139,8 +285,9 @@ class Embedder:
             actual_cost = (tokens_used / 1_000_000) * self.COSTS.get(self.model, 0.02)
             
             # Track costs
-            self.total_tokens_used += tokens_used
-            self.total_cost_usd += actual_cost
+            with self._cost_lock:
+                self.total_tokens_used += tokens_used
+                self.total_cost_usd += actual_cost
             
             logger.info(
                 "embedding_generated",
@@ -149,8 +296,10 @@ class Embedder:
                 total_cost_usd=round(self.total_cost_usd, 4)
             )
             
+            self._set_cached(text, embedding, tokens_used)
+            
             return EmbeddingResult(
-                vector=embedding,
+                vector=_normalize(np.asarray(embedding, dtype=np.float32)),
                 model=self.model,
                 token_count=tokens_used,
                 cost_usd=actual_cost
@@ -178,55 +327,122 @@ class Embedder:
         if not texts:
             return []
         
-        # Estimate total cost
-        total_estimated_cost = sum(self.estimate_cost(text) for text in texts if text)
+        # Serve repeated content (e.g. redelivered Pub/Sub messages) from the cache
+        results = [self._get_cached(text) if text else None for text in texts]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        
+        # Embed each distinct text once; repeated boilerplate reuses the result
+        unique_index: Dict[str, int] = {}
+        for i in pending:
+            unique_index.setdefault(texts[i], len(unique_index))
+        unique_results = self._embed_uncached(list(unique_index))
+        
+        seen = set()
+        for i in pending:
+            result = unique_results[unique_index[texts[i]]]
+            if result is not None and texts[i] in seen:
+                # Only the first occurrence carries the cost of the API call
+                result = replace(result, cost_usd=0.0)
+            seen.add(texts[i])
+            results[i] = result
+        
+        return results
+    
+    def _embed_uncached(self, texts: List[str]) -> List[Optional[EmbeddingResult]]:
+        """
+        Embed texts through the API, after the budget check.
+        
+        Args:
+            texts: Texts not found in the cache
+            
+        Returns:
+            List of EmbeddingResults
+        """
+        # Tokenize once; the counts serve both the estimate and per-item accounting
+        token_counts = self._count_tokens_batch(texts)
+        cost_per_token = self.COSTS.get(self.model, 0.02) / 1_000_000
+        total_estimated_cost = sum(token_counts) * cost_per_token
         
         if not self.check_budget(total_estimated_cost):
             logger.error("batch_embedding_halted_budget_exceeded")
             return [None] * len(texts)
         
-        results = []
+        # Send the batches concurrently; map keeps results in input order
+        starts = range(0, len(texts), self.batch_size)
+        workers = min(self.MAX_CONCURRENT_REQUESTS, len(starts))
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            batch_results = executor.map(
+                lambda i: self._embed_batch_request(
+                    texts[i:i + self.batch_size],
+                    token_counts[i:i + self.batch_size],
+                    i
+                ),
+                starts
+            )
+            return [result for batch in batch_results for result in batch]
+    
+    def _embed_batch_request(
+        self,
+        batch: List[str],
+        token_counts: List[int],
+        batch_start: int
+    ) -> List[Optional[EmbeddingResult]]:
+        """
+        Embed one batch with a single API call.
         
-        # Process in batches
-        for i in range(0, len(texts), self.batch_size):
-            batch = texts[i:i + self.batch_size]
+        Args:
+            batch: Texts to embed
+            token_counts: Token count of each text in the batch
+            batch_start: Offset of the batch within the full input, for logging
             
-            try:
-                response = self.client.embeddings.create(
-                    model=self.model,
-                    input=batch
-                )
-                
-                tokens_used = response.usage.total_tokens
-                actual_cost = (tokens_used / 1_000_000) * self.COSTS.get(self.model, 0.02)
-                
-                # Track costs
+        Returns:
+            List of EmbeddingResults, or Nones if the request failed
+        """
+        try:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=batch
+            )
+            
+            tokens_used = response.usage.total_tokens
+            cost_per_token = self.COSTS.get(self.model, 0.02) / 1_000_000
+            actual_cost = tokens_used * cost_per_token
+            
+            # Track costs
+            with self._cost_lock:
                 self.total_tokens_used += tokens_used
                 self.total_cost_usd += actual_cost
-                
-                logger.info(
-                    "batch_embeddings_generated",
-                    batch_size=len(batch),
-                    tokens=tokens_used,
-                    cost_usd=round(actual_cost, 6),
-                    total_cost_usd=round(self.total_cost_usd, 4)
-                )
-                
-                # Create results for each embedding
-                for j, embedding_data in enumerate(response.data):
-                    results.append(EmbeddingResult(
-                        vector=embedding_data.embedding,
-                        model=self.model,
-                        token_count=tokens_used // len(batch),  # Approximate
-                        cost_usd=actual_cost / len(batch)  # Approximate
-                    ))
-                    
-            except Exception as e:
-                logger.error("batch_embedding_failed", error=str(e), batch_start=i)
-                # Add None for failed batch
-                results.extend([None] * len(batch))
-        
-        return results
+                total_cost_usd = self.total_cost_usd
+            
+            logger.info(
+                "batch_embeddings_generated",
+                batch_size=len(batch),
+                tokens=tokens_used,
+                cost_usd=round(actual_cost, 6),
+                total_cost_usd=round(total_cost_usd, 4)
+            )
+            
+            # Create results for each embedding, in input order
+            results = []
+            for embedding_data in sorted(response.data, key=lambda d: d.index):
+                text = batch[embedding_data.index]
+                token_count = token_counts[embedding_data.index]
+                self._set_cached(text, embedding_data.embedding, token_count)
+                results.append(EmbeddingResult(
+                    vector=_normalize(np.asarray(embedding_data.embedding, dtype=np.float32)),
+                    model=self.model,
+                    token_count=token_count,
+                    cost_usd=token_count * cost_per_token
+                ))
+            return results
+            
+        except Exception as e:
+            logger.error("batch_embedding_failed", error=str(e), batch_start=batch_start)
+            # Add None for failed batch
+            return [None] * len(batch)
     
     def get_cost_summary(self) -> Dict[str, Any]:
         """
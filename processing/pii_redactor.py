@@ -2,14 +2,91 @@
 PII redaction module for protecting sensitive information.
 """
 import re
-from typing import List, Tuple, Dict
+import sys
+import functools
+from typing import List, Tuple, Dict, Optional, Set
 from dataclasses import dataclass
 import structlog
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import regex
+except ImportError:
+    regex = None
+
 logger = structlog.get_logger()
 
 
-@dataclass
+def _without_possessive(pattern: str) -> str:
+    """
+    Turn possessive quantifiers (++, ?+) into greedy ones.
+
+    Needed for engines that do not support them (RE2, and re before Python
+    3.11). PATTERNS only use possessive quantifiers where backtracking could
+    never produce a match, so the greedy form matches the same strings.
+    """
+    return pattern.replace("++", "+").replace("?+", "?")
+
+
+def _compile_fused(patterns: Dict[str, str], exclude: Set[str] = frozenset()) -> "re.Pattern":
+    """
+    Combine PII patterns into one regex of named groups.
+
+    Compiled with RE2 when google-re2 is installed, which matches in linear
+    time on untrusted text (no catastrophic backtracking). RE2 lacks
+    backreferences, lookaround and possessive quantifiers; the first two are
+    unused and the last are rewritten as greedy. Its \\b only treats ASCII
+    characters as word characters. Otherwise the regex module (or re) is
+    used, where possessive quantifiers in the patterns cut down backtracking.
+
+    Args:
+        patterns: Mapping of PII type to regex; must not contain capturing groups.
+        exclude: PII types to leave out.
+
+    Returns:
+        Compiled regex; match.lastgroup is the PII type.
+    """
+    fused = "|".join(
+        f"(?P<{pii_type}>{pattern})"
+        for pii_type, pattern in patterns.items()
+        if pii_type not in exclude
+    )
+    if re2 is not None:
+        return re2.compile(_without_possessive(fused))
+
+    if regex is not None:
+        return regex.compile(fused)
+
+    if sys.version_info < (3, 11):
+        return re.compile(_without_possessive(fused))
+    return re.compile(fused)
+
+
+def _group_tables(fused: "re.Pattern", replacements: Dict[str, str]) -> Tuple[tuple, tuple]:
+    """
+    Build PII type and replacement tuples indexed by group number.
+
+    Each PII type is its own group in a fused regex, so match.lastindex picks
+    both values by tuple index instead of hashing match.lastgroup.
+
+    Args:
+        fused: Regex built by _compile_fused.
+        replacements: Mapping of PII type to replacement text.
+
+    Returns:
+        Tuple of (types, replacements); index 0 is unused.
+    """
+    types = [None] * (fused.groups + 1)
+    for pii_type, index in fused.groupindex.items():
+        types[index] = pii_type
+    return tuple(types), tuple(replacements.get(pii_type) for pii_type in types)
+
+
+@dataclass(slots=True, frozen=True)
 class RedactionResult:
     """Result of PII redaction."""
     redacted_text: str
@@ -20,10 +97,11 @@ class RedactionResult:
 class PIIRedactor:
     """Redacts personally identifiable information from text."""
     
-    # Regex patterns for PII detection
+    # Regex patterns for PII detection (no capturing groups; the fused regex names each type)
     PATTERNS = {
-        "email": r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-        "phone": r'\b(?:\+?1[-.]?)?\(?([0-9]{3})\)?[-.]?([0-9]{3})[-.]?([0-9]{4})\b',
+        "email": r'\b[A-Za-z0-9._%+-]++@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
+        # The optional country code stays backtrackable: "1234567890" needs it dropped
+        "phone": r'\b(?:\+?+1[-.]?+)?\(?+[0-9]{3}\)?+[-.]?+[0-9]{3}[-.]?+[0-9]{4}\b',
         "api_key": r'\b(?:sk-|pk_|key-)[a-zA-Z0-9]{20,}\b',
         "aws_key": r'\b(?:AKIA|ASIA)[A-Z0-9]{16}\b',
         "credit_card": r'\b(?:4[0-9]{12}(?:[0-9]{3})?|5[1-5][0-9]{14}|3[47][0-9]{13})\b',
@@ -42,6 +120,26 @@ class PIIRedactor:
         "ip_address": "[IP_REDACTED]",
         "bearer_token": "[BEARER_TOKEN_REDACTED]",
     }
+
+    # Substrings every match of a PII type contains at least one of; a type
+    # whose literals are all absent from a text is left out of its regex
+    _DIGITS = ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9")
+    _PREFILTERS = {
+        "email": ("@",),
+        "phone": _DIGITS,
+        "api_key": ("sk-", "pk_", "key-"),
+        "aws_key": ("AKIA", "ASIA"),
+        "credit_card": _DIGITS,
+        "ssn": _DIGITS,
+        "ip_address": _DIGITS,
+        "bearer_token": ("Bearer",),
+    }
+
+    # Each distinct literal tuple, so shared ones (digits) are checked once per text
+    _PREFILTER_LITERALS = frozenset(_PREFILTERS.values())
+
+    # Distinct texts whose redaction results are memoized across calls
+    REDACT_CACHE_SIZE = 4096
     
     def __init__(self, enabled: bool = True):
         """
@@ -77,26 +175,13 @@ class PIIRedactor:
                 redaction_count=0
             )
         
-        redacted_text = text
-        redactions = []
-        
-        for pii_type, pattern in self.PATTERNS.items():
-            matches = list(re.finditer(pattern, redacted_text))
-            
-            for match in matches:
-                original_value = match.group(0)
-                replacement = self.REPLACEMENTS[pii_type]
-                
-                # Record redaction
-                redactions.append({
-                    "type": pii_type,
-                    "position": match.start(),
-                    "length": len(original_value),
-                    "replacement": replacement
-                })
-                
-                # Perform redaction
-                redacted_text = redacted_text.replace(original_value, replacement, 1)
+        redacted_text, matches = self._redact_cached(text)
+
+        # Fresh dicts per call, so callers can't alter the memoized result
+        redactions = [
+            {"type": pii_type, "position": position, "length": length, "replacement": replacement}
+            for pii_type, position, length, replacement in matches
+        ]
         
         if redactions and log_redactions:
             logger.info(
@@ -111,10 +196,100 @@ class PIIRedactor:
             redaction_count=len(redactions)
         )
     
+    @classmethod
+    @functools.lru_cache(maxsize=REDACT_CACHE_SIZE)
+    def _redact_cached(cls, text: str) -> Tuple[str, tuple]:
+        """
+        Redact text, memoized for chunks that are redacted repeatedly.
+
+        Args:
+            text: Non-empty text to redact
+
+        Returns:
+            Tuple of (redacted text, tuple of (type, position, length, replacement))
+        """
+        selected = cls._select_regex(text)
+        if selected is None:
+            return text, ()
+
+        matches = []
+        fused, types, replacements = selected
+
+        def replace(match: re.Match) -> str:
+            # The matching group identifies the PII type
+            index = match.lastindex
+            replacement = replacements[index]
+
+            # Record redaction (position in the original text)
+            matches.append((types[index], match.start(), match.end() - match.start(), replacement))
+            return replacement
+
+        # Perform all redactions in one pass
+        return fused.sub(replace, text), tuple(matches)
+
+    @classmethod
+    def _select_regex(cls, text: str) -> Optional[Tuple["re.Pattern", tuple, tuple]]:
+        """
+        Cheaply pick the fused regex needed to find the PII in text.
+
+        Substring checks for each type's _PREFILTERS literals run far faster
+        than the regex, so only types that can occur in text are matched, and
+        texts that can't contain any PII skip regex matching entirely.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            (fused regex, types, replacements) from _fused_for, or None if
+            the text cannot contain PII
+        """
+        candidates = cls._candidate_types(text)
+        if not candidates:
+            return None
+        return cls._fused_for(candidates)
+
+    @classmethod
+    def _candidate_types(cls, text: str) -> frozenset:
+        """
+        Find the PII types whose _PREFILTERS literals occur in text.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            PII types that can occur in text
+        """
+        present = {
+            literals: any(literal in text for literal in literals)
+            for literals in cls._PREFILTER_LITERALS
+        }
+        return frozenset(
+            pii_type for pii_type, literals in cls._PREFILTERS.items() if present[literals]
+        )
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _fused_for(cls, pii_types: frozenset) -> Tuple["re.Pattern", tuple, tuple]:
+        """
+        Compile the fused regex for a set of PII types, once per distinct set.
+
+        Args:
+            pii_types: PII types to match
+
+        Returns:
+            Tuple of (fused regex, types, replacements); the tables are indexed
+            by match.lastindex
+        """
+        fused = _compile_fused(cls.PATTERNS, exclude=frozenset(cls.PATTERNS) - pii_types)
+        return (fused, *_group_tables(fused, cls.REPLACEMENTS))
+    
     def scan_for_pii(self, text: str) -> Dict[str, int]:
         """
         Scan text for PII without redacting.
         
+        Unlike redact, each type is matched on its own, so PII inside a match
+        of another type (e.g. an IP address after "Bearer ") is still counted.
+        
         Args:
             text: Text to scan
             
@@ -124,12 +299,17 @@ class PIIRedactor:
         if not text:
             return {}
         
+        candidates = self._candidate_types(text)
         findings = {}
         
-        for pii_type, pattern in self.PATTERNS.items():
-            matches = re.findall(pattern, text)
-            if matches:
-                findings[pii_type] = len(matches)
+        # Types the prefilter rules out can't match, so their regexes are skipped
+        for pii_type in self.PATTERNS:
+            if pii_type not in candidates:
+                continue
+            pattern = self._fused_for(frozenset((pii_type,)))[0]
+            count = sum(1 for _ in pattern.finditer(text))
+            if count:
+                findings[pii_type] = count
         
         return findings
 
@@ -7,7 +7,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from audit.pii_scanner import PIIScanner
+from audit.pii_scanner import PIIScanner, scan_json_files
 from audit.volume_estimator import VolumeEstimator
 import json
 import structlog
@@ -40,14 +40,16 @@ def run_pii_scan():
     all_results = []
     all_passed = True
 
+    existing_files = []
     for file_path in sample_files:
         if not Path(file_path).exists():
             print(f"\n⚠️  {file_path} not found - skipping")
             continue
+        existing_files.append(file_path)
 
-        print(f"\n📄 Scanning {file_path}...")
-        result = scanner.scan_json_file(file_path)
-
+    # Files are scanned in parallel worker processes
+    for file_path, result in scan_json_files(existing_files):
+        print(f"\n📄 Scanned {file_path}")
         print(f"   Items scanned: {result.total_items_scanned}")
         print(f"   PII matches found: {result.pii_matches_found}")
         print(f"   Critical matches: {len(result.critical_matches)}")
@@ -3,6 +3,7 @@ Export sample data from Slack, Notion, and Google Drive for audit.
 """
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Add parent directory to path
@@ -11,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from api.slack_client import SlackClient
 from api.notion_client import NotionClient
 from api.drive_client import DriveClient
+from storage.cache_manager import CloudStorageCache
 from dotenv import load_dotenv
 import structlog
 
@@ -51,7 +53,7 @@ def export_notion_samples(num_pages: int = 20):
     """Export sample Notion pages."""
     print(f"\n📄 Exporting {num_pages} Notion pages...")
     try:
-        client = NotionClient()
+        client = NotionClient(cache=CloudStorageCache())
         if not client.test_connection():
             print("❌ Notion connection failed")
             return False
@@ -72,7 +74,7 @@ def export_drive_samples(num_docs: int = 10):
     """Export sample Google Drive documents."""
     print(f"\n📁 Exporting {num_docs} Google Drive documents...")
     try:
-        client = DriveClient()
+        client = DriveClient(cache=CloudStorageCache())
         if not client.test_connection():
             print("❌ Google Drive connection failed")
             return False
@@ -113,12 +115,15 @@ def main():
         print("\nPlease set these in your .env file")
         return 1
 
-    # Export samples from each source
-    results = {
-        "slack": export_slack_samples(num_messages=500),
-        "notion": export_notion_samples(num_pages=20),
-        "drive": export_drive_samples(num_docs=10)
-    }
+    # Export samples from each source concurrently; the sources are independent
+    # and each export is dominated by network I/O
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {
+            "slack": executor.submit(export_slack_samples, num_messages=500),
+            "notion": executor.submit(export_notion_samples, num_pages=20),
+            "drive": executor.submit(export_drive_samples, num_docs=10)
+        }
+    results = {source: future.result() for source, future in futures.items()}
 
     # Summary
     print("\n" + "=" * 60)
@@ -0,0 +1,27 @@
+"""
+Rename cache files to the current key-hash scheme.
+
+Run once after upgrading from the SHA-256 file names, so existing cache
+entries keep being found. ISO-8601 timestamps are converted to epoch
+seconds, and valid entries get their expiry recorded in the file mtime,
+which clear_expired and get_stats rely on.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from storage.cache_manager import CloudStorageCache
+
+
+def main(cache_dir: str = "./cache") -> int:
+    """Migrate every entry in cache_dir."""
+    cache = CloudStorageCache(cache_dir=cache_dir)
+    migrated = cache.migrate_key_hashes()
+    print(f"✅ Migrated {migrated} cache entries in {cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
@@ -10,6 +10,89 @@ import sys
 # Load environment variables
 load_dotenv()
 
+# Announcement text, also used as the notification fallback for the blocks
+DEMO_TEXT = "🤖 Knowledge Summarizer Agent - Ready for Deployment!"
+
+# Thread reply pointing at the interactive demo
+DEMO_LINK_TEXT = (
+    "🎥 *Interactive Demo:* Open this in your browser to see the live animation!\n"
+    "https://github.com/AfricanTobacco/Knowledge-Summarizer-Agent/blob/main/demo/agent-demo.html"
+)
+
+# Block Kit payload for the announcement; built once at import
+DEMO_BLOCKS = [
+    {
+        "type": "header",
+        "text": {
+            "type": "plain_text",
+            "text": DEMO_TEXT,
+            "emoji": True
+        }
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*Exciting news!* The Knowledge Summarizer Agent is now complete and ready for GCP deployment. 🚀"
+        }
+    },
+    {
+        "type": "divider"
+    },
+    {
+        "type": "section",
+        "fields": [
+            {
+                "type": "mrkdwn",
+                "text": "*⚡ Speed*\n50-60% faster retrieval"
+            },
+            {
+                "type": "mrkdwn",
+                "text": "*💰 Cost*\n~$20-55/month (prototype)"
+            },
+            {
+                "type": "mrkdwn",
+                "text": "*🎯 Response Time*\n<3 seconds"
+            },
+            {
+                "type": "mrkdwn",
+                "text": "*🔒 Compliance*\nPOPIA compliant"
+            }
+        ]
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*✨ What it does:*\n• Searches across Slack, Notion, and Google Drive\n• Uses AI to generate instant summaries\n• `/summarize [your question]` command for quick answers\n• Weekly knowledge digests auto-posted to #general"
+        }
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*🎬 See it in action:*\nWatch the 15-second demo showing the complete workflow from query to answer!"
+        }
+    },
+    {
+        "type": "section",
+        "text": {
+            "type": "mrkdwn",
+            "text": "*📦 Repository:* `AfricanTobacco/Knowledge-Summarizer-Agent`\n*🏗️ Architecture:* GCP Cloud Functions + Pinecone Vector DB + Claude AI\n*👥 Teams:* Jerome (Infrastructure) | Mako (Compliance)"
+        }
+    },
+    {
+        "type": "context",
+        "elements": [
+            {
+                "type": "mrkdwn",
+                "text": "💡 *Next Steps:* Deploy to GCP → Configure data sources → Test with real queries"
+            }
+        ]
+    }
+]
+
+
 def post_demo_to_slack(channel: str = "#general"):
     """
     Post demo announcement to Slack channel.
@@ -26,84 +109,11 @@ def post_demo_to_slack(channel: str = "#general"):
         
         client = WebClient(token=token)
         
-        # Craft the message
-        message_blocks = [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": "🤖 Knowledge Summarizer Agent - Ready for Deployment!",
-                    "emoji": True
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*Exciting news!* The Knowledge Summarizer Agent is now complete and ready for GCP deployment. 🚀"
-                }
-            },
-            {
-                "type": "divider"
-            },
-            {
-                "type": "section",
-                "fields": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "*⚡ Speed*\n50-60% faster retrieval"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": "*💰 Cost*\n~$20-55/month (prototype)"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": "*🎯 Response Time*\n<3 seconds"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": "*🔒 Compliance*\nPOPIA compliant"
-                    }
-                ]
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*✨ What it does:*\n• Searches across Slack, Notion, and Google Drive\n• Uses AI to generate instant summaries\n• `/summarize [your question]` command for quick answers\n• Weekly knowledge digests auto-posted to #general"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*🎬 See it in action:*\nWatch the 15-second demo showing the complete workflow from query to answer!"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*📦 Repository:* `AfricanTobacco/Knowledge-Summarizer-Agent`\n*🏗️ Architecture:* GCP Cloud Functions + Pinecone Vector DB + Claude AI\n*👥 Teams:* Jerome (Infrastructure) | Mako (Compliance)"
-                }
-            },
-            {
-                "type": "context",
-                "elements": [
-                    {
-                        "type": "mrkdwn",
-                        "text": "💡 *Next Steps:* Deploy to GCP → Configure data sources → Test with real queries"
-                    }
-                ]
-            }
-        ]
-        
         # Post message
         response = client.chat_postMessage(
             channel=channel,
-            blocks=message_blocks,
-            text="🤖 Knowledge Summarizer Agent - Ready for Deployment!"
+            blocks=DEMO_BLOCKS,
+            text=DEMO_TEXT
         )
         
         print(f"✅ Message posted successfully to {channel}!")
@@ -111,10 +121,9 @@ def post_demo_to_slack(channel: str = "#general"):
         print(f"   Channel: {response['channel']}")
         
         # Post demo HTML link as a follow-up
-        demo_link = "https://github.com/AfricanTobacco/Knowledge-Summarizer-Agent/blob/main/demo/agent-demo.html"
         client.chat_postMessage(
             channel=channel,
-            text=f"🎥 *Interactive Demo:* Open this in your browser to see the live animation!\n{demo_link}",
+            text=DEMO_LINK_TEXT,
             thread_ts=response['ts']  # Post as thread reply
         )
         
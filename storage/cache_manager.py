@@ -3,24 +3,78 @@ Cache manager for short-term storage using Cloud Storage (prototype) or Memoryst
 """
 import os
 import json
+import time
+import hashlib
+import threading
 from typing import Any, Optional
-from datetime import datetime, timedelta
 from pathlib import Path
 import structlog
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = structlog.get_logger()
 
 
+def _dumps(data: Any) -> bytes:
+    """Serialize a cache entry, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode("utf-8")
+
+
+def _is_expired(cache_data: dict) -> bool:
+    """Check a cache entry's epoch expiry; entries without one count as expired."""
+    expires_at = cache_data.get("expires_at")
+    return not isinstance(expires_at, (int, float)) or time.time() > expires_at
+
+
+def _upgrade_timestamps(cache_data: dict) -> bool:
+    """Convert ISO-8601 timestamps from older entries to epoch seconds in place."""
+    # Only migrations touch legacy entries, so datetime stays off the hot path
+    from datetime import datetime, timezone
+    
+    upgraded = False
+    for field in ("created_at", "expires_at"):
+        value = cache_data.get(field)
+        if isinstance(value, str):
+            # Older entries were written with naive datetime.utcnow()
+            parsed = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+            cache_data[field] = parsed.timestamp()
+            upgraded = True
+    return upgraded
+
+
+def _hash_key(key: str) -> str:
+    """Derive a filesystem-safe name from a cache key."""
+    # BLAKE2b is much cheaper than SHA-256 on short keys; 128 bits is ample
+    # to keep file names unique
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize a cache entry, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class CloudStorageCache:
     """
     Simple file-based cache for prototype (uses Cloud Storage in GCP deployment).
     For production, this can be swapped with Memorystore Redis.
     """
     
+    # Share of max_entries kept after pruning, so pruning doesn't run on every set
+    PRUNE_TO_FRACTION = 0.9
+    
     def __init__(
         self,
         cache_dir: str = "./cache",
-        default_ttl_seconds: int = 604800  # 7 days
+        default_ttl_seconds: int = 604800,  # 7 days
+        max_entries: Optional[int] = None
     ):
         """
         Initialize cache.
@@ -28,19 +82,25 @@ class CloudStorageCache:
         Args:
             cache_dir: Directory for cache storage
             default_ttl_seconds: Default TTL in seconds (7 days default)
+            max_entries: Entry limit; beyond it expired entries and then the
+                         ones closest to expiry are removed. Unbounded if None
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
+        
+        # Upper bound on the entry count (deletes aren't tracked); _prune
+        # recounts exactly. The lock covers concurrent sets from worker threads
+        self._entry_count = sum(1 for _ in self._iter_entries()) if max_entries else 0
+        self._count_lock = threading.Lock()
         
         logger.info("cache_initialized", cache_dir=str(self.cache_dir))
     
     def _get_cache_path(self, key: str) -> Path:
         """Get file path for cache key."""
         # Hash key to avoid filesystem issues
-        import hashlib
-        key_hash = hashlib.sha256(key.encode()).hexdigest()
-        return self.cache_dir / f"{key_hash}.json"
+        return self.cache_dir / f"{_hash_key(key)}.json"
     
     def set(
         self,
@@ -61,18 +121,29 @@ class CloudStorageCache:
         """
         try:
             ttl = ttl_seconds or self.default_ttl_seconds
-            expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+            now = time.time()
             
+            # Timestamps are epoch seconds, so reads compare floats instead of parsing dates
             cache_data = {
                 "key": key,
                 "value": value,
-                "created_at": datetime.utcnow().isoformat(),
-                "expires_at": expires_at.isoformat()
+                "created_at": now,
+                "expires_at": now + ttl
             }
             
             cache_path = self._get_cache_path(key)
-            with open(cache_path, 'w') as f:
-                json.dump(cache_data, f)
+            is_new = self.max_entries is not None and not cache_path.exists()
+            cache_path.write_bytes(_dumps(cache_data))
+            
+            # Mirror the expiry into the file's mtime so bulk scans can check it
+            # with a stat instead of reading and parsing every entry
+            os.utime(cache_path, (now, now + ttl))
+            
+            if is_new:
+                with self._count_lock:
+                    self._entry_count += 1
+                    if self._entry_count > self.max_entries:
+                        self._prune()
             
             logger.debug("cache_set", key=key, ttl_seconds=ttl)
             return True
@@ -98,12 +169,10 @@ class CloudStorageCache:
                 logger.debug("cache_miss", key=key)
                 return None
             
-            with open(cache_path, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = _loads(cache_path.read_bytes())
             
             # Check expiration
-            expires_at = datetime.fromisoformat(cache_data["expires_at"])
-            if datetime.utcnow() > expires_at:
+            if _is_expired(cache_data):
                 logger.debug("cache_expired", key=key)
                 self.delete(key)
                 return None
@@ -135,6 +204,46 @@ class CloudStorageCache:
             logger.error("cache_delete_failed", key=key, error=str(e))
             return False
     
+    def _iter_entries(self):
+        """Yield a DirEntry for each cache file, from a single directory scan."""
+        # DirEntry takes the file type from the listing and caches its stat(),
+        # so callers stat each file at most once
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield entry
+    
+    def _prune(self) -> None:
+        """
+        Shrink the cache to PRUNE_TO_FRACTION of max_entries.
+        
+        Expired entries go first, then those expiring soonest (the oldest,
+        with a uniform TTL). The caller holds _count_lock.
+        """
+        entries = []
+        for entry in self._iter_entries():
+            try:
+                # mtime holds the entry's expiry (see set)
+                entries.append((entry.stat().st_mtime, entry.path))
+            except OSError:
+                continue
+        
+        entries.sort()
+        now = time.time()
+        target = int(self.max_entries * self.PRUNE_TO_FRACTION)
+        removed = 0
+        for expires_at, path in entries:
+            if expires_at >= now and len(entries) - removed <= target:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except OSError:
+                continue
+        
+        self._entry_count = len(entries) - removed
+        logger.info("cache_pruned", removed=removed, remaining=self._entry_count)
+    
     def clear_expired(self) -> int:
         """
         Clear all expired cache entries.
@@ -145,14 +254,12 @@ class CloudStorageCache:
         cleared_count = 0
         
         try:
-            for cache_file in self.cache_dir.glob("*.json"):
+            now = time.time()
+            for entry in self._iter_entries():
                 try:
-                    with open(cache_file, 'r') as f:
-                        cache_data = json.load(f)
-                    
-                    expires_at = datetime.fromisoformat(cache_data["expires_at"])
-                    if datetime.utcnow() > expires_at:
-                        cache_file.unlink()
+                    # mtime holds the entry's expiry (see set)
+                    if entry.stat().st_mtime < now:
+                        os.unlink(entry.path)
                         cleared_count += 1
                         
                 except Exception:
@@ -167,6 +274,48 @@ class CloudStorageCache:
             logger.error("cache_cleanup_failed", error=str(e))
             return 0
     
+    def migrate_key_hashes(self) -> int:
+        """
+        Rename entries written under an older key-hash scheme to their current path.
+        
+        Each entry stores its original key, so the file name can be recomputed.
+        ISO-8601 timestamps from older entries are rewritten as epoch seconds,
+        and valid entries get their expiry copied into the file mtime.
+        
+        Returns:
+            Number of entries renamed
+        """
+        migrated_count = 0
+        
+        try:
+            for entry in self._iter_entries():
+                try:
+                    cache_file = Path(entry.path)
+                    cache_data = _loads(cache_file.read_bytes())
+                    
+                    target = self._get_cache_path(cache_data["key"])
+                    if _upgrade_timestamps(cache_data):
+                        cache_file.write_bytes(_dumps(cache_data))
+                    if target != cache_file:
+                        cache_file.replace(target)
+                        migrated_count += 1
+                    
+                    # Older entries don't carry their expiry in mtime yet
+                    if not _is_expired(cache_data):
+                        os.utime(target, (cache_data["created_at"], cache_data["expires_at"]))
+                        
+                except Exception:
+                    continue
+            
+            if migrated_count > 0:
+                logger.info("cache_keys_migrated", count=migrated_count)
+            
+            return migrated_count
+            
+        except Exception as e:
+            logger.error("cache_key_migration_failed", error=str(e))
+            return 0
+    
     def get_stats(self) -> dict:
         """
         Get cache statistics.
@@ -175,19 +324,21 @@ class CloudStorageCache:
             Dictionary with cache stats
         """
         try:
-            cache_files = list(self.cache_dir.glob("*.json"))
-            total_size_bytes = sum(f.stat().st_size for f in cache_files)
+            total_entries = 0
+            total_size_bytes = 0
             
             valid_count = 0
             expired_count = 0
+            now = time.time()
             
-            for cache_file in cache_files:
+            for entry in self._iter_entries():
+                total_entries += 1
                 try:
-                    with open(cache_file, 'r') as f:
-                        cache_data = json.load(f)
+                    # One stat gives both size and expiry (mtime, see set)
+                    stat = entry.stat()
+                    total_size_bytes += stat.st_size
                     
-                    expires_at = datetime.fromisoformat(cache_data["expires_at"])
-                    if datetime.utcnow() > expires_at:
+                    if stat.st_mtime < now:
                         expired_count += 1
                     else:
                         valid_count += 1
@@ -195,7 +346,7 @@ class CloudStorageCache:
                     continue
             
             return {
-                "total_entries": len(cache_files),
+                "total_entries": total_entries,
                 "valid_entries": valid_count,
                 "expired_entries": expired_count,
                 "total_size_bytes": total_size_bytes,
@@ -220,7 +371,6 @@ if __name__ == "__main__":
     
     # Test expiration
     cache.set("short_ttl", "expires soon", ttl_seconds=1)
-    import time
     time.sleep(2)
     expired_value = cache.get("short_ttl")
     print(f"✅ Expired value should be None: {expired_value}")
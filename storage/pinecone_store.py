@@ -2,13 +2,76 @@
 Pinecone vector database integration for semantic search.
 """
 import os
+import json
+import time
+import random
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
 import structlog
 from datetime import datetime
 
+try:
+    from pinecone.grpc import PineconeGRPC
+except ImportError:
+    PineconeGRPC = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = structlog.get_logger()
 
+# Connected index handles, keyed by (api_key, index_name, pool_threads)
+_INDEXES: Dict[tuple, Any] = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(api_key: str) -> Any:
+    """
+    Shared Pinecone client per API key.
+    
+    Stores created in the same process (the bot, digest and ingest
+    functions) reuse one client instead of each opening their own
+    connections. Uses gRPC when the grpc extra is installed.
+    """
+    return (PineconeGRPC if PineconeGRPC is not None else Pinecone)(api_key=api_key)
+
+
+def _to_values(vector: Any) -> List[float]:
+    """Convert a numpy embedding to the plain list the Pinecone SDK expects."""
+    return vector.tolist() if hasattr(vector, "tolist") else vector
+
+
+def _dumps(data: Any, sort_keys: bool = False) -> str:
+    """Serialize to a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(data, option=option).decode("utf-8")
+    return json.dumps(data, sort_keys=sort_keys)
+
+
+def _loads(data: str) -> Any:
+    """Deserialize a JSON string, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _unit_vector(vector: Any) -> np.ndarray:
+    """Return the vector as unit-length float32, so dot products are cosines."""
+    unit = np.array(vector, dtype=np.float32)
+    norm = np.linalg.norm(unit)
+    if norm > 0:
+        unit /= norm
+    return unit
+
 
 class PineconeStore:
     """Manages vector storage and retrieval in Pinecone."""
@@ -19,13 +82,58 @@ class PineconeStore:
         "drive": "drive/"
     }
     
+    # Namespace holding query embeddings alongside their cached responses;
+    # responses cached before the content generation stamp are ignored
+    QUERY_CACHE_NAMESPACE = "query_cache/"
+    
+    # ID of the row in QUERY_CACHE_NAMESPACE holding the content generation stamp
+    QUERY_CACHE_GENERATION_ID = "__content_generation__"
+    
+    # A content write stamps the generation this far in the future, so further
+    # writes within the window need no extra Pinecone request
+    QUERY_CACHE_GENERATION_WINDOW_SECONDS = 60
+    
+    # How long a lookup reuses the generation stamp it last fetched; bounds how
+    # long writes by other processes can go unnoticed
+    QUERY_CACHE_GENERATION_TTL_SECONDS = 10
+    
+    # Minimum cosine similarity for a cached query to count as the same query
+    QUERY_CACHE_MIN_SCORE = 0.97
+    
+    # Cached query responses expire after 1 day
+    QUERY_CACHE_TTL_SECONDS = 86400
+    
+    # In-memory cache of raw query results, keyed by exact query vector
+    QUERY_RESULT_CACHE_SIZE = 1024
+    
+    # Bounds how stale results can get from upserts by other processes
+    QUERY_RESULT_CACHE_TTL_SECONDS = 300
+    
+    # (namespace, id) -> content hash of recently upserted vectors, so
+    # re-synced, unchanged items are not sent again (~250 bytes per entry)
+    UPSERT_HASH_CACHE_SIZE = 50000
+    
+    # Share of successful queries logged; slower queries are always logged
+    QUERY_LOG_SAMPLE_RATE = 0.01
+    SLOW_QUERY_MS = 200
+    
+    # Pinecone accepts at most 1000 IDs per delete request
+    DELETE_BATCH_SIZE = 1000
+    
+    # Recent query vectors searched by similarity when the exact key misses;
+    # small enough that a brute-force dot product takes well under a millisecond
+    QUERY_SIMILARITY_CACHE_SIZE = 1024
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         environment: Optional[str] = None,
         index_name: str = "knowledge-summarizer",
         dimension: int = 1536,  # text-embedding-3-small dimension
-        metric: str = "cosine"
+        metric: str = "dotproduct",
+        pool_threads: int = 30,
+        batch_size: int = 100,
+        stats_ttl_seconds: float = 5.0
     ):
         """
         Initialize Pinecone store.
@@ -35,25 +143,67 @@ class PineconeStore:
             environment: Pinecone environment
             index_name: Name of the index
             dimension: Vector dimension
-            metric: Distance metric (cosine, euclidean, dotproduct)
+            metric: Distance metric (cosine, euclidean, dotproduct). Embedder
+                    returns unit-length vectors, so dotproduct ranks like cosine
+                    without per-query normalization
+            pool_threads: Threads the REST index uses for concurrent requests
+            batch_size: Vectors per upsert request
+            stats_ttl_seconds: How long get_index_stats reuses its last result
         """
         self.api_key = api_key or os.getenv("PINECONE_API_KEY")
         self.environment = environment or os.getenv("PINECONE_ENVIRONMENT", "gcp-starter")
         self.index_name = index_name
         self.dimension = dimension
         self.metric = metric
+        self.pool_threads = pool_threads
+        self.batch_size = batch_size
+        self.stats_ttl_seconds = stats_ttl_seconds
+        
+        # (time.monotonic() when fetched, stats) from the last describe_index_stats
+        self._stats_cache: Optional[tuple] = None
         
         if not self.api_key:
             raise ValueError("PINECONE_API_KEY must be set")
         
-        # Initialize Pinecone
-        self.pc = Pinecone(api_key=self.api_key)
+        # Initialize Pinecone, over gRPC when the grpc extra is installed
+        self._grpc = PineconeGRPC is not None
+        self.pc = _get_client(self.api_key)
+        
+        # Kept for the store's lifetime so repeated fan-out queries reuse
+        # threads; threads are only started as concurrent queries need them
+        self._query_executor = ThreadPoolExecutor(max_workers=max(pool_threads, len(self.NAMESPACES)))
+        
+        # LRU of query key -> (expires_at, results); the lock covers fan-out threads
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        
+        # Ring buffer of recent unit query vectors (allocated on first use) and
+        # their (context, expires_at, results), for near-duplicate queries
+        self._similar_vectors: Optional[np.ndarray] = None
+        self._similar_entries: List[Optional[tuple]] = [None] * self.QUERY_SIMILARITY_CACHE_SIZE
+        self._similar_next = 0
+        
+        # (time.monotonic() when fetched, stamp) of the content generation, and
+        # the stamp this process last wrote
+        self._generation_cache: Optional[tuple] = None
+        self._generation_written = 0.0
+        self._generation_lock = threading.Lock()
+        
+        # LRU of (namespace, id) -> content hash from successful upserts
+        self._upserted_hashes: OrderedDict = OrderedDict()
+        self._upserted_hashes_lock = threading.Lock()
         
         # Create or connect to index
         self._init_index()
     
     def _init_index(self):
         """Initialize or connect to Pinecone index."""
+        # Reuse a handle (and its connection pool) another store already opened
+        index_key = (self.api_key, self.index_name, self.pool_threads)
+        self.index = _INDEXES.get(index_key)
+        if self.index is not None:
+            return
+        
         try:
             # Check if index exists
             existing_indexes = [idx.name for idx in self.pc.list_indexes()]
@@ -72,10 +222,18 @@ class PineconeStore:
                 )
                 logger.info("pinecone_index_created", index_name=self.index_name)
             
-            # Connect to index
-            self.index = self.pc.Index(self.index_name)
+            # Connect to index; the REST client needs a thread pool for async_req
+            if self._grpc:
+                self.index = self.pc.Index(self.index_name)
+            else:
+                self.index = self.pc.Index(self.index_name, pool_threads=self.pool_threads)
+            _INDEXES[index_key] = self.index
             logger.info("connected_to_pinecone_index", index_name=self.index_name)
             
+            # Open the connection (TLS, HTTP/2 or gRPC channel) now rather than
+            # on the first real query; the response seeds the stats cache
+            self.get_index_stats(force=True)
+            
         except Exception as e:
             logger.error("pinecone_init_failed", error=str(e))
             raise
@@ -91,55 +249,97 @@ class PineconeStore:
         Upsert vectors to Pinecone.
         
         Args:
-            vectors: List of embedding vectors
+            vectors: Embedding vectors, as a list or an (N, dimension) array
             ids: List of unique IDs for each vector
             metadata: List of metadata dictionaries
             namespace: Namespace to store vectors in
             
         Returns:
-            Dictionary with upsert count
+            Dictionary with the number of vectors upserted and of unchanged
+            vectors skipped
         """
-        if not vectors or len(vectors) != len(ids) or len(vectors) != len(metadata):
+        if len(vectors) == 0 or len(vectors) != len(ids) or len(vectors) != len(metadata):
             raise ValueError("Vectors, IDs, and metadata must have same length")
         
+        # One float32 matrix, so bad dimensions fail here instead of at Pinecone
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(ids), self.dimension):
+            raise ValueError(
+                f"Expected vectors of shape ({len(ids)}, {self.dimension}), got {vectors.shape}"
+            )
+        
         try:
-            # Prepare vectors for upsert
-            vectors_to_upsert = [
-                {
+            # One timestamp for the whole call rather than one per vector
+            indexed_at = datetime.utcnow().isoformat()
+            
+            # Send each batch as soon as it is built, so payload preparation
+            # overlaps the requests already in flight; wait for them together
+            pending = []
+            batch = []
+            sent_hashes = []
+            for vid, vector, meta in zip(ids, vectors, metadata):
+                # indexed_at is excluded, so a re-sync of unchanged content matches
+                key = (namespace, vid)
+                content_hash = hashlib.blake2b(
+                    vector.tobytes() + _dumps(meta, sort_keys=True).encode("utf-8"),
+                    digest_size=16
+                ).digest()
+                with self._upserted_hashes_lock:
+                    unchanged = self._upserted_hashes.get(key) == content_hash
+                if unchanged:
+                    continue
+                
+                sent_hashes.append((key, content_hash))
+                batch.append({
                     "id": vid,
-                    "values": vector,
-                    "metadata": {
-                        **meta,
-                        "indexed_at": datetime.utcnow().isoformat()
-                    }
-                }
-                for vid, vector, meta in zip(ids, vectors, metadata)
-            ]
+                    "values": vector.tolist(),
+                    "metadata": {**meta, "indexed_at": indexed_at}
+                })
+                if len(batch) == self.batch_size:
+                    pending.append(self.index.upsert(vectors=batch, namespace=namespace, async_req=True))
+                    batch = []
+            if batch and pending:
+                pending.append(self.index.upsert(vectors=batch, namespace=namespace, async_req=True))
+                batch = []
             
-            # Upsert in batches of 100
-            batch_size = 100
-            total_upserted = 0
+            responses = self._wait_all(pending)
+            if batch:
+                # The only batch (e.g. a single vector) has nothing to overlap
+                # with, so send it directly instead of via the thread pool
+                responses.append(self.index.upsert(vectors=batch, namespace=namespace))
+            total_upserted = sum(response.upserted_count for response in responses)
+            skipped = len(ids) - len(sent_hashes)
             
-            for i in range(0, len(vectors_to_upsert), batch_size):
-                batch = vectors_to_upsert[i:i + batch_size]
-                response = self.index.upsert(
-                    vectors=batch,
-                    namespace=namespace
-                )
-                total_upserted += response.upserted_count
+            if sent_hashes:
+                self._clear_query_cache()
+                self._bump_content_generation(namespace)
+                with self._upserted_hashes_lock:
+                    for key, content_hash in sent_hashes:
+                        self._upserted_hashes[key] = content_hash
+                        self._upserted_hashes.move_to_end(key)
+                    while len(self._upserted_hashes) > self.UPSERT_HASH_CACHE_SIZE:
+                        self._upserted_hashes.popitem(last=False)
             
             logger.info(
                 "vectors_upserted",
                 count=total_upserted,
+                skipped_unchanged=skipped,
                 namespace=namespace
             )
             
-            return {"upserted_count": total_upserted}
+            return {"upserted_count": total_upserted, "skipped_count": skipped}
             
         except Exception as e:
             logger.error("vector_upsert_failed", error=str(e), namespace=namespace)
             raise
     
+    def _wait_all(self, pending: List[Any]) -> List[Any]:
+        """Wait for async_req requests in order and return their responses."""
+        # gRPC returns futures, the REST client multiprocessing ApplyResults
+        if self._grpc:
+            return [future.result() for future in pending]
+        return [result.get() for result in pending]
+    
     def query(
         self,
         vector: List[float],
@@ -161,36 +361,194 @@ class PineconeStore:
         Returns:
             List of matching results with scores and metadata
         """
+        vector = np.asarray(vector, dtype=np.float32)
+        if vector.shape != (self.dimension,):
+            logger.error(
+                "query_failed",
+                error=f"expected a {self.dimension}-dim vector, got shape {vector.shape}",
+                namespace=namespace
+            )
+            return []
+        
+        cache_key = self._query_cache_key(vector, namespace, top_k, filter, include_metadata)
+        cached = self._get_cached_query(cache_key, vector)
+        if cached is not None:
+            logger.debug("query_result_cache_hit", namespace=namespace)
+            return cached
+        
         try:
+            started = time.perf_counter()
             response = self.index.query(
-                vector=vector,
+                vector=vector.tolist(),
                 namespace=namespace,
                 top_k=top_k,
                 filter=filter,
                 include_metadata=include_metadata
             )
+            elapsed_ms = (time.perf_counter() - started) * 1000
             
-            results = []
-            for match in response.matches:
-                results.append({
+            results = [
+                {
                     "id": match.id,
                     "score": match.score,
                     "metadata": match.metadata if include_metadata else {}
-                })
+                }
+                for match in response.matches
+            ]
             
-            logger.info(
-                "query_executed",
-                namespace=namespace,
-                top_k=top_k,
-                results_count=len(results)
-            )
+            # Sampled, since formatting a log line per query adds up at high QPS
+            if elapsed_ms > self.SLOW_QUERY_MS or random.random() < self.QUERY_LOG_SAMPLE_RATE:
+                logger.info(
+                    "query_executed",
+                    namespace=namespace,
+                    top_k=top_k,
+                    results_count=len(results),
+                    elapsed_ms=round(elapsed_ms, 1)
+                )
             
+            self._set_cached_query(cache_key, vector, results)
             return results
             
         except Exception as e:
             logger.error("query_failed", error=str(e), namespace=namespace)
             return []
     
+    @staticmethod
+    def _query_cache_key(
+        vector: List[float],
+        namespace: str,
+        top_k: int,
+        filter: Optional[Dict[str, Any]],
+        include_metadata: bool
+    ) -> tuple:
+        """Build the result-cache key for a query."""
+        vector_hash = hashlib.blake2b(np.asarray(vector, dtype=np.float32).tobytes(), digest_size=16).digest()
+        filter_key = _dumps(filter, sort_keys=True) if filter else None
+        return (vector_hash, namespace, top_k, filter_key, include_metadata)
+    
+    def _get_cached_query(self, cache_key: tuple, vector: List[float]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return unexpired cached results for a query, or None.
+        
+        An exact key match is tried first; otherwise the results of a recent
+        query with the same parameters and a vector at least
+        QUERY_CACHE_MIN_SCORE cosine-similar are reused.
+        
+        Args:
+            cache_key: Key from _query_cache_key
+            vector: Query vector
+            
+        Returns:
+            Cached results or None
+        """
+        now = time.time()
+        with self._query_cache_lock:
+            entry = self._query_cache.get(cache_key)
+            if entry is not None and now > entry[0]:
+                del self._query_cache[cache_key]
+                entry = None
+            
+            if entry is not None:
+                self._query_cache.move_to_end(cache_key)
+                results = entry[1]
+            else:
+                results = self._find_similar_query(cache_key[1:], vector, now)
+                if results is None:
+                    return None
+        
+        # A new list, so callers can't reorder or extend the cached one
+        return list(results)
+    
+    def _find_similar_query(
+        self,
+        context: tuple,
+        vector: List[float],
+        now: float
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Search the similarity ring buffer; the caller holds the cache lock."""
+        if self._similar_vectors is None:
+            return None
+        
+        query = _unit_vector(vector)
+        if query.shape != self._similar_vectors.shape[1:]:
+            return None
+        
+        # Unused rows are zero, so they never reach the threshold
+        scores = self._similar_vectors @ query
+        for row in np.argsort(scores)[::-1]:
+            if scores[row] < self.QUERY_CACHE_MIN_SCORE:
+                break
+            entry = self._similar_entries[row]
+            if entry is not None and entry[0] == context and entry[1] >= now:
+                return entry[2]
+        return None
+    
+    def _set_cached_query(self, cache_key: tuple, vector: List[float], results: List[Dict[str, Any]]) -> None:
+        """Cache query results, evicting the least recently used (or oldest similar) entry when full."""
+        expires_at = time.time() + self.QUERY_RESULT_CACHE_TTL_SECONDS
+        results = list(results)
+        query = _unit_vector(vector)
+        
+        with self._query_cache_lock:
+            self._query_cache[cache_key] = (expires_at, results)
+            self._query_cache.move_to_end(cache_key)
+            if len(self._query_cache) > self.QUERY_RESULT_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+            
+            if self._similar_vectors is None:
+                self._similar_vectors = np.zeros(
+                    (self.QUERY_SIMILARITY_CACHE_SIZE, query.shape[0]), dtype=np.float32
+                )
+            if query.shape != self._similar_vectors.shape[1:]:
+                return
+            
+            row = self._similar_next
+            self._similar_vectors[row] = query
+            self._similar_entries[row] = (cache_key[1:], expires_at, results)
+            self._similar_next = (row + 1) % self.QUERY_SIMILARITY_CACHE_SIZE
+    
+    def _clear_query_cache(self) -> None:
+        """Drop cached query results after this store changes the index."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+            self._similar_vectors = None
+            self._similar_entries = [None] * self.QUERY_SIMILARITY_CACHE_SIZE
+            self._similar_next = 0
+    
+    def query_batch(
+        self,
+        vectors: List[List[float]],
+        namespace: str = "default",
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = True
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Run several independent queries against one namespace concurrently.
+        
+        Args:
+            vectors: Query vectors
+            namespace: Namespace to query
+            top_k: Number of results per query
+            filter: Metadata filter applied to every query
+            include_metadata: Whether to include metadata in results
+            
+        Returns:
+            One result list per vector, in the order of vectors
+        """
+        futures = [
+            self._query_executor.submit(
+                self.query,
+                vector=vector,
+                namespace=namespace,
+                top_k=top_k,
+                filter=filter,
+                include_metadata=include_metadata
+            )
+            for vector in vectors
+        ]
+        return [future.result() for future in futures]
+    
     def query_all_namespaces(
         self,
         vector: List[float],
@@ -200,6 +558,9 @@ class PineconeStore:
         """
         Query across all namespaces.
         
+        The namespaces are queried concurrently, so latency is that of the
+        slowest namespace rather than the sum.
+        
         Args:
             vector: Query vector
             top_k: Number of results per namespace
@@ -210,23 +571,205 @@ class PineconeStore:
         """
         all_results = {}
         
-        for source, namespace in self.NAMESPACES.items():
-            results = self.query(
+        # Convert once rather than in each namespace's query
+        vector = np.asarray(vector, dtype=np.float32)
+        futures = {
+            source: self._query_executor.submit(
+                self.query,
                 vector=vector,
                 namespace=namespace,
                 top_k=top_k,
                 filter=filter
             )
+            for source, namespace in self.NAMESPACES.items()
+        }
+        
+        for source, future in futures.items():
+            results = future.result()
             if results:
                 all_results[source] = results
         
         return all_results
     
+    def get_cached_response(
+        self,
+        vector: List[float],
+        cache_filter: Optional[Dict[str, Any]] = None
+    ) -> Optional[Any]:
+        """
+        Look up a cached response for a semantically equivalent query.
+        
+        Responses cached before the current content generation stamp are
+        ignored, so they are never served after the indexed content changes.
+        
+        Args:
+            vector: Query embedding
+            cache_filter: Extra metadata that must match, e.g. query parameters
+            
+        Returns:
+            Cached response or None if no close, unexpired match exists
+        """
+        try:
+            response = self.index.query(
+                vector=_to_values(vector),
+                namespace=self.QUERY_CACHE_NAMESPACE,
+                top_k=1,
+                filter={
+                    **(cache_filter or {}),
+                    "cached_at": {"$gt": self._content_generation()},
+                    "expires_at": {"$gt": time.time()}
+                },
+                include_metadata=True
+            )
+            
+            if not response.matches or response.matches[0].score < self.QUERY_CACHE_MIN_SCORE:
+                logger.debug("query_cache_miss")
+                return None
+            
+            match = response.matches[0]
+            logger.info("query_cache_hit", score=match.score)
+            return _loads(match.metadata["response"])
+            
+        except Exception as e:
+            logger.error("query_cache_lookup_failed", error=str(e))
+            return None
+    
+    def cache_response(
+        self,
+        query_text: str,
+        vector: List[float],
+        response: Any,
+        cache_metadata: Optional[Dict[str, Any]] = None,
+        ttl_seconds: Optional[int] = None
+    ) -> bool:
+        """
+        Store a response keyed by its query embedding.
+        
+        Args:
+            query_text: Original query text
+            vector: Query embedding
+            response: JSON-serializable response to cache
+            cache_metadata: Extra metadata to filter on at lookup time
+            ttl_seconds: TTL in seconds (QUERY_CACHE_TTL_SECONDS if not specified)
+            
+        Returns:
+            True if successful
+        """
+        try:
+            ttl = ttl_seconds or self.QUERY_CACHE_TTL_SECONDS
+            cached_at = time.time()
+            cache_metadata = cache_metadata or {}
+            key_source = json.dumps([query_text, cache_metadata], sort_keys=True)
+            cache_id = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+            
+            self.index.upsert(
+                vectors=[{
+                    "id": cache_id,
+                    "values": _to_values(vector),
+                    "metadata": {
+                        **cache_metadata,
+                        "response": _dumps(response),
+                        "cached_at": cached_at,
+                        "expires_at": cached_at + ttl
+                    }
+                }],
+                namespace=self.QUERY_CACHE_NAMESPACE
+            )
+            
+            logger.debug("query_cache_set", ttl_seconds=ttl)
+            return True
+            
+        except Exception as e:
+            logger.error("query_cache_set_failed", error=str(e))
+            return False
+    
+    def _content_generation(self) -> float:
+        """
+        Get the content generation stamp, reusing a recent fetch.
+        
+        Returns:
+            Stamp (epoch seconds) before which cached responses are stale, or
+            0.0 if none has been written
+        """
+        now = time.monotonic()
+        with self._generation_lock:
+            if self._generation_cache and now - self._generation_cache[0] < self.QUERY_CACHE_GENERATION_TTL_SECONDS:
+                return self._generation_cache[1]
+        
+        try:
+            response = self.index.fetch(
+                ids=[self.QUERY_CACHE_GENERATION_ID],
+                namespace=self.QUERY_CACHE_NAMESPACE
+            )
+            record = response.vectors.get(self.QUERY_CACHE_GENERATION_ID)
+            stamp = float(record.metadata["generation"]) if record else 0.0
+        except Exception as e:
+            # Treat every cached response as stale rather than risk serving one
+            logger.warning("query_cache_generation_fetch_failed", error=str(e))
+            return time.time()
+        
+        with self._generation_lock:
+            stamp = max(stamp, self._generation_written)
+            self._generation_cache = (now, stamp)
+        return stamp
+    
+    def _bump_content_generation(self, changed_namespace: str) -> None:
+        """
+        Invalidate cached query responses after content changes.
+        
+        The stamp is set QUERY_CACHE_GENERATION_WINDOW_SECONDS ahead, so
+        writes before it passes (e.g. the remaining batches of an ingest) are
+        already covered and send nothing. A new stamp invalidates every
+        existing cached response, so they are deleted at the same time to keep
+        the namespace from accumulating stale rows (serverless indexes can't
+        delete by metadata filter).
+        
+        Args:
+            changed_namespace: Namespace whose content changed
+        """
+        if changed_namespace == self.QUERY_CACHE_NAMESPACE:
+            return
+        
+        now = time.time()
+        with self._generation_lock:
+            if now < self._generation_written:
+                return
+            stamp = now + self.QUERY_CACHE_GENERATION_WINDOW_SECONDS
+            self._generation_written = stamp
+            self._generation_cache = (time.monotonic(), stamp)
+        
+        try:
+            self.index.delete(delete_all=True, namespace=self.QUERY_CACHE_NAMESPACE)
+        except Exception as e:
+            # Pinecone reports a missing namespace (nothing cached yet) as not found
+            if "not found" not in str(e).lower():
+                logger.warning("query_cache_clear_failed", error=str(e))
+        
+        try:
+            # Dense vectors need a non-zero value; the row has no expires_at,
+            # so it never matches a cache lookup
+            values = [0.0] * self.dimension
+            values[0] = 1.0
+            self.index.upsert(
+                vectors=[{
+                    "id": self.QUERY_CACHE_GENERATION_ID,
+                    "values": values,
+                    "metadata": {"generation": stamp}
+                }],
+                namespace=self.QUERY_CACHE_NAMESPACE
+            )
+            logger.debug("query_cache_generation_bumped", generation=stamp)
+        except Exception as e:
+            # Allow the next write to retry, since other processes missed this one
+            with self._generation_lock:
+                self._generation_written = 0.0
+            logger.warning("query_cache_generation_bump_failed", error=str(e))
+    
     def delete_vectors(
         self,
         ids: List[str],
         namespace: str = "default"
-    ) -> Dict[str, bool]:
+    ) -> Dict[str, Any]:
         """
         Delete vectors by ID.
         
@@ -235,31 +778,73 @@ class PineconeStore:
             namespace: Namespace to delete from
             
         Returns:
-            Dictionary with success status
+            Dictionary with success status and number of IDs deleted
         """
         try:
-            self.index.delete(ids=ids, namespace=namespace)
+            # Send every batch at once and wait for them together, as in upsert
+            pending = [
+                self.index.delete(
+                    ids=ids[i:i + self.DELETE_BATCH_SIZE],
+                    namespace=namespace,
+                    async_req=True
+                )
+                for i in range(0, len(ids), self.DELETE_BATCH_SIZE)
+            ]
+            self._wait_all(pending)
+            
+            self._clear_query_cache()
+            self._bump_content_generation(namespace)
+            with self._upserted_hashes_lock:
+                for vid in ids:
+                    self._upserted_hashes.pop((namespace, vid), None)
             logger.info("vectors_deleted", count=len(ids), namespace=namespace)
-            return {"success": True}
+            return {"success": True, "deleted": len(ids)}
         except Exception as e:
             logger.error("vector_deletion_failed", error=str(e))
             return {"success": False}
     
-    def get_index_stats(self) -> Dict[str, Any]:
+    def get_index_stats(self, force: bool = False) -> Dict[str, Any]:
         """
         Get index statistics.
         
+        Stats change slowly, so a result younger than stats_ttl_seconds is
+        returned without another request.
+        
+        Args:
+            force: Fetch fresh stats even if a cached result is available
+        
+        Cached query responses are not content, so QUERY_CACHE_NAMESPACE is
+        left out of the vector count and the namespaces.
+        
         Returns:
             Dictionary with index stats
         """
+        if (
+            not force
+            and self._stats_cache is not None
+            and time.monotonic() - self._stats_cache[0] < self.stats_ttl_seconds
+        ):
+            return dict(self._stats_cache[1])
+        
         try:
             stats = self.index.describe_index_stats()
-            return {
-                "total_vector_count": stats.total_vector_count,
+            namespaces = dict(stats.namespaces or {})
+            cache_summary = namespaces.pop(self.QUERY_CACHE_NAMESPACE, None)
+            cached_count = 0
+            if cache_summary is not None:
+                # A NamespaceSummary, or a plain dict depending on the client
+                cached_count = (
+                    cache_summary["vector_count"] if isinstance(cache_summary, dict)
+                    else cache_summary.vector_count
+                )
+            result = {
+                "total_vector_count": stats.total_vector_count - cached_count,
                 "dimension": stats.dimension,
                 "index_fullness": stats.index_fullness,
-                "namespaces": stats.namespaces
+                "namespaces": namespaces
             }
+            self._stats_cache = (time.monotonic(), result)
+            return dict(result)
         except Exception as e:
             logger.error("stats_retrieval_failed", error=str(e))
             return {}
@@ -0,0 +1,17 @@
+"""
+Tests for the PII scanner.
+"""
+from audit.pii_scanner import PIIScanner
+
+
+def test_critical_pii_overlapped_by_earlier_match_is_reported():
+    # The email match runs into the JWT, which starts inside it
+    matches = PIIScanner().scan_text("john.doe@example.com.eyJhbGciOi.eyJzdWIiOi.sig")
+
+    assert {match.type for match in matches} == {"email", "jwt_token"}
+
+
+def test_match_is_not_reported_again_for_its_own_suffix():
+    matches = PIIScanner().scan_text("Contact john.doe@example.com for access")
+
+    assert [match.type for match in matches] == ["email"]